@@ -0,0 +1,65 @@
+"""
+Micro-benchmark de la limpieza de texto: `clean_text` fila por fila
+(como lo hacía `preprocess_reviews`) contra `normalize_texts` por lotes.
+
+Ejecución desde la raíz del repositorio:
+
+    python -m benchmarks.bench_clean_text --rows 200000
+"""
+import argparse
+import random
+import string
+import time
+
+import pandas as pd
+
+from src.modules.analisis_NLP import SentimentAnalysis
+
+WORDS = ["great", "book", "Loved", "it!", "boring...", "the", "plot", "isn't", "bad,", "(really)"]
+
+
+def synthetic_reviews(rows: int, seed: int = 0) -> pd.Series:
+    """
+    Genera reseñas sintéticas con mayúsculas, puntuación y espacios repetidos.
+    """
+    rng = random.Random(seed)
+    spaces = [" ", "  ", "\t", "\n "]
+    return pd.Series(
+        [
+            "".join(rng.choice(WORDS) + rng.choice(spaces) for _ in range(rng.randint(5, 120)))
+            + rng.choice(string.punctuation)
+            for _ in range(rows)
+        ]
+    )
+
+
+def rows_per_second(func, texts: pd.Series, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = synthetic_reviews(args.rows)
+    before, expected = rows_per_second(
+        lambda t: t.astype(str).apply(SentimentAnalysis.clean_text), texts, args.repeat
+    )
+    after, result = rows_per_second(SentimentAnalysis.normalize_texts, texts, args.repeat)
+
+    if not expected.equals(result):
+        raise SystemExit("Error: normalize_texts no produce la misma salida que clean_text.")
+    print(f"clean_text (por fila):     {before:,.0f} filas/s")
+    print(f"normalize_texts (lotes):   {after:,.0f} filas/s")
+    print(f"Aceleración:               {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
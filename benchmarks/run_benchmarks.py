@@ -0,0 +1,217 @@
+"""
+Benchmark de cada etapa del pipeline sobre datos sintéticos.
+
+Mide tiempo de pared, tiempo de CPU, pico de RSS y filas por segundo de
+cada etapa y escribe el resultado en JSON para compararlo entre versiones.
+
+Ejecución desde la raíz del repositorio:
+
+    python -m benchmarks.run_benchmarks --rows 10000 100000 --output bench.json
+    python -m benchmarks.run_benchmarks --rows 100000 --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from benchmarks import sintetico
+from src.modules.agregados import BookAggregateStore
+from src.modules.analisis_NLP import SentimentAnalysis
+from src.modules.cargar_data import REVIEW_COLUMNS, REVIEW_DTYPES, cargar_data
+from src.modules.duplicados import NearDuplicateDetector
+from src.modules.particiones import PartitionedAnalysis
+from src.modules.perfilado import PeakRSSSampler
+from src.modules.top_libros import TopBooksAnalysis
+from src.modules.visualizacion import DataVisualization, render_report
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "3m": 3_000_000}
+REGRESSION_THRESHOLD = 0.10
+# Etapas más rápidas que esto son ruido de medición y no se comparan.
+MIN_COMPARABLE_SECONDS = 0.05
+
+
+@contextmanager
+def measure(results: dict, stage: str, rows: int):
+    """
+    Mide una etapa y guarda sus métricas en `results[stage]`.
+    """
+    sampler = PeakRSSSampler()
+    baseline = sampler.baseline
+    sampler.start()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+        peak = sampler.stop()
+        results[stage] = {
+            "seconds": round(seconds, 4),
+            "cpu_seconds": round(cpu_seconds, 4),
+            "peak_rss_mb": round(peak / 2**20, 1),
+            "rss_delta_mb": round((peak - baseline) / 2**20, 1),
+            "rows": rows,
+            "rows_per_sec": round(rows / seconds, 1) if seconds else None,
+        }
+        print(f"  {stage:<28} {seconds:>9.3f} s  {peak / 2**20:>8.1f} MiB  {rows:>10} filas")
+
+
+def run_scale(rows: int, workdir: str, textblob_rows: int, seed: int) -> dict:
+    """
+    Ejecuta todas las etapas para una escala y devuelve sus métricas.
+    """
+    results = {}
+    print(f"\nEscala: {rows} reseñas")
+    with measure(results, "generate", rows):
+        books_path, reviews_path = sintetico.write(workdir, rows, seed=seed)
+
+    loader = cargar_data(reviews_path, cache_dir=os.path.join(workdir, "cache"))
+    with measure(results, "load_csv", rows):
+        reviews = loader.load_csv()
+    with measure(results, "clean_csv", len(reviews)):
+        reviews = loader.clean_csv()
+    with measure(results, "compact", len(reviews)):
+        compacted = cargar_data.compact_frame(reviews)
+    results["compact"]["reduction"] = round(
+        reviews.memory_usage(deep=True).sum() / compacted.memory_usage(deep=True).sum(), 2
+    )
+    del compacted
+    with measure(results, "stream_csv", rows):
+        streamed = sum(len(chunk) for chunk in loader.stream_csv(usecols=REVIEW_COLUMNS, dtype=REVIEW_DTYPES))
+    results["stream_csv"]["rows_out"] = streamed
+    with measure(results, "detect_outliers", len(reviews)):
+        loader.detect_outliers("review/score")
+    with measure(results, "detect_outliers_streaming", len(reviews)):
+        loader.detect_outliers_streaming(
+            ["review/score", "Price"],
+            chunk_source=lambda: (reviews.iloc[i:i + 100_000] for i in range(0, len(reviews), 100_000)),
+        )
+
+    texts = reviews["review/text"]
+    with measure(results, "clean_text", len(texts)):
+        texts.astype(str).apply(SentimentAnalysis.clean_text)
+    with measure(results, "normalize_texts", len(texts)):
+        reviews["review/text"] = SentimentAnalysis.normalize_texts(texts)
+    detector = NearDuplicateDetector()
+    with measure(results, "near_duplicates", len(texts)):
+        for start in range(0, len(reviews), 100_000):
+            detector.update(reviews["review/text"].iloc[start:start + 100_000])
+    results["near_duplicates"]["clusters"] = detector.clusters
+
+    sample = reviews.head(textblob_rows).copy()
+    with measure(results, "calculate_sentiments_textblob", len(sample)):
+        SentimentAnalysis(sample).calculate_sentiments()
+    SentimentAnalysis.lexicon_scorer()
+    with measure(results, "calculate_sentiments_lexicon", len(reviews)):
+        SentimentAnalysis(reviews, backend="lexicon").calculate_sentiments()
+
+    reviews = reviews.rename(
+        columns={"Title": "book_title", "review/score": "rating", "sentiment_score": "sentiment"}
+    )
+    with measure(results, "top_books_groupby", len(reviews)):
+        analyzer = TopBooksAnalysis(reviews)
+        analyzer.top_books_by_reviews()
+        analyzer.top_books_by_average_rating()
+        analyzer.top_books_by_sentiment(reviews)
+    with measure(results, "rank_books", len(reviews)):
+        analyzer.rank_books(min_reviews=5, bayesian=True)
+    with measure(results, "aggregate_store", len(reviews)):
+        store = BookAggregateStore.from_frame(reviews)
+    with measure(results, "partitioned_lexicon", rows):
+        PartitionedAnalysis(reviews_path, os.path.join(workdir, "partitioned"), backend="lexicon").run()
+
+    books = pd.read_csv(books_path)
+    books = books.merge(
+        store.summary()[["book_title", "average_rating"]],
+        left_on="Title", right_on="book_title", how="left",
+    )
+    visualizer = DataVisualization(
+        books, reviews.rename(columns={"sentiment": "sentiment_score"}), output_dir=os.path.join(workdir, "plots")
+    )
+    with measure(results, "plots", len(reviews)):
+        visualizer.plot_top_books_by_reviews()
+        visualizer.plot_top_authors_by_books()
+        visualizer.plot_average_ratings_by_category()
+        visualizer.plot_sentiment_distribution()
+    with measure(results, "render_report", len(reviews)):
+        render_report(visualizer.report_aggregates(), visualizer.output_dir)
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """
+    Compara dos reportes y devuelve las etapas más lentas que el umbral.
+    """
+    regressions = []
+    for scale, stages in current["scales"].items():
+        for stage, metrics in stages.items():
+            before = baseline.get("scales", {}).get(scale, {}).get(stage)
+            if not before or before["seconds"] < MIN_COMPARABLE_SECONDS:
+                continue
+            change = metrics["seconds"] / before["seconds"] - 1
+            flag = "REGRESIÓN" if change > threshold else ""
+            print(f"  {scale:>8} {stage:<28} {before['seconds']:>9.3f} -> {metrics['seconds']:>9.3f} s ({change:+.1%}) {flag}")
+            if flag:
+                regressions.append({"scale": scale, "stage": stage, "change": round(change, 4)})
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", nargs="+", default=["10k"],
+                        help=f"Escalas: número de filas o {', '.join(SCALES)}.")
+    parser.add_argument("--textblob-rows", type=int, default=5_000,
+                        help="Reseñas puntuadas con TextBlob (es la etapa más lenta).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", help="Reporte JSON previo con el cual comparar.")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "textblob_rows": args.textblob_rows,
+        },
+        "scales": {},
+    }
+    for scale in args.rows:
+        rows = SCALES.get(scale.lower()) or int(scale)
+        with tempfile.TemporaryDirectory() as workdir:
+            report["scales"][str(rows)] = run_scale(rows, workdir, args.textblob_rows, args.seed)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReporte escrito en {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nComparación con {args.compare}:")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} etapas más lentas que el umbral de {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
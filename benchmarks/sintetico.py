@@ -0,0 +1,144 @@
+"""
+Generador determinista de datos sintéticos con la forma de
+`books_data.csv` y `books_rating.csv` del dataset de Amazon Books Reviews.
+
+Ejecución desde la raíz del repositorio:
+
+    python -m benchmarks.sintetico --rows 100000 --output ./src/data/synthetic
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+POSITIVE = ["good", "great", "excellent", "amazing", "wonderful", "loved", "best", "beautiful", "interesting", "fun"]
+NEGATIVE = ["bad", "boring", "terrible", "awful", "worst", "poor", "disappointing", "dull", "weak", "slow"]
+MODIFIERS = ["very", "really", "not", "never", "extremely", "quite"]
+FILLER = [
+    "the", "book", "story", "author", "characters", "plot", "read", "was", "is", "and",
+    "it", "this", "a", "of", "to", "in", "i", "chapter", "writing", "ending",
+]
+CATEGORIES = ["Fiction", "History", "Religion", "Juvenile Fiction", "Biography & Autobiography",
+              "Business & Economics", "Computers", "Social Science", "Science", "Cooking"]
+
+
+def _texts(rng: np.random.Generator, rows: int, mean_words: int) -> list:
+    vocabulary = np.array(FILLER * 4 + POSITIVE + NEGATIVE + MODIFIERS, dtype=object)
+    lengths = np.clip(rng.lognormal(np.log(mean_words), 0.7, rows).astype(int), 3, 1_000)
+    words = vocabulary[rng.integers(0, len(vocabulary), lengths.sum())]
+    punctuation = np.array([" ", " ", " ", ", ", ". ", "! ", "  "], dtype=object)
+    separators = punctuation[rng.integers(0, len(punctuation), lengths.sum())]
+    tokens = words + separators
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return ["".join(tokens[start:end]).strip().capitalize() for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def generate(
+    rows: int,
+    books: int = None,
+    duplicate_rate: float = 0.03,
+    shared_text_rate: float = 0.25,
+    null_rate: float = 0.01,
+    mean_words: int = 80,
+    seed: int = 0,
+):
+    """
+    Genera los DataFrames de libros y reseñas.
+
+    Args:
+        rows (int): Número de reseñas (antes de agregar duplicados exactos).
+        books (int, optional): Número de libros. Por defecto, `rows // 14`, la
+            proporción aproximada del dataset real (~212k libros, 3M reseñas).
+        duplicate_rate (float): Fracción de reseñas repetidas exactamente.
+        shared_text_rate (float): Fracción de reseñas que reutilizan el texto de
+            otra reseña bajo otro título (la misma reseña en varias ediciones).
+        null_rate (float): Fracción de valores nulos en columnas opcionales.
+        mean_words (int): Longitud media (mediana log-normal) de las reseñas en palabras.
+        seed (int): Semilla del generador.
+
+    Returns:
+        tuple: (books_data, books_rating) como pd.DataFrame.
+    """
+    rng = np.random.default_rng(seed)
+    books = books or max(10, rows // 14)
+    titles = np.array([f"Synthetic Book {i:07d}" for i in range(books)], dtype=object)
+    authors = np.array([f"Author {i:06d}" for i in range(max(5, books // 3))], dtype=object)
+
+    # La mayoría de los libros tiene un autor; algunos, dos o tres coautores.
+    author_lists = [
+        str(list(dict.fromkeys(authors[rng.integers(0, len(authors), n)])))
+        for n in rng.choice([1, 1, 1, 2, 3], books)
+    ]
+    books_data = pd.DataFrame({
+        "Title": titles,
+        "description": "Synthetic description",
+        "authors": author_lists,
+        "image": "http://books.google.com/books/content?id=synthetic",
+        "previewLink": "http://books.google.com/books?id=synthetic",
+        "publisher": rng.choice([f"Publisher {i}" for i in range(200)], books),
+        "publishedDate": rng.integers(1950, 2014, books).astype(str),
+        "infoLink": "http://books.google.com/books?id=synthetic&dq=synthetic",
+        "categories": [str([c]) for c in rng.choice(CATEGORIES, books)],
+        "ratingsCount": np.round(rng.pareto(1.5, books) * 5 + 1),
+    })
+
+    # La popularidad de los libros sigue una ley de potencias, como en Amazon.
+    popularity = rng.zipf(1.3, rows) % books
+    texts = np.array(_texts(rng, rows, mean_words), dtype=object)
+    shared = rng.random(rows) < shared_text_rate
+    texts[shared] = texts[rng.integers(0, rows, shared.sum())]
+    reviews = pd.DataFrame({
+        "Id": [f"B{i:09d}" for i in popularity],
+        "Title": titles[popularity],
+        "Price": np.round(rng.gamma(2.0, 10.0, rows), 2),
+        "User_id": [f"A{i:012d}" for i in rng.integers(0, max(1, rows // 2), rows)],
+        "profileName": [f"Reader {i}" for i in rng.integers(0, max(1, rows // 2), rows)],
+        "review/helpfulness": [f"{h}/{h + t}" for h, t in rng.integers(0, 20, (rows, 2))],
+        "review/score": rng.choice([1.0, 2.0, 3.0, 4.0, 5.0], rows, p=[0.07, 0.05, 0.08, 0.2, 0.6]),
+        "review/time": rng.integers(820_000_000, 1_362_000_000, rows),
+        "review/summary": "Synthetic summary",
+        "review/text": texts,
+    })
+    for column in ("Price", "profileName", "review/summary"):
+        reviews.loc[rng.random(rows) < null_rate, column] = None
+
+    duplicates = reviews.iloc[np.flatnonzero(rng.random(rows) < duplicate_rate)]
+    reviews = pd.concat([reviews, duplicates], ignore_index=True)
+    reviews = reviews.iloc[rng.permutation(len(reviews))].reset_index(drop=True)
+    return books_data, reviews
+
+
+def write(output_dir: str, rows: int, **options) -> tuple:
+    """
+    Genera los datos y los escribe como `books_data.csv` y `books_rating.csv`.
+
+    Args:
+        output_dir (str): Carpeta de destino.
+        rows (int): Número de reseñas.
+        **options: Opciones de `generate`.
+
+    Returns:
+        tuple: Rutas de (books_data.csv, books_rating.csv).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    books_data, reviews = generate(rows, **options)
+    books_path = os.path.join(output_dir, "books_data.csv")
+    reviews_path = os.path.join(output_dir, "books_rating.csv")
+    books_data.to_csv(books_path, index=False)
+    reviews.to_csv(reviews_path, index=False)
+    print(f"Datos sintéticos escritos en {output_dir}: {len(books_data)} libros, {len(reviews)} reseñas.")
+    return books_path, reviews_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--output", default="./src/data/synthetic")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write(args.output, args.rows, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,44 @@
-from src.modules.analisis_exp import ExploratoryAnalysis
-from src.modules.analisis_NLP import SentimentAnalysis
-from src.modules.cargar_data import cargar_data
-from src.modules.top_libros import TopBooksAnalysis
-from src.modules.visualizacion import DataVisualization
+import sys
 
-def main():
-    # Ruta de los datos
-    book_details_path = "./src/data/books_data.csv"
-    reviews_path = "./src/data/books_rating.csv"
+from src.modules.perfilado import PROFILER
+from src.modules.pipeline import PipelineRunner
 
-    # === Módulo de Carga de Datos ===
-    print("Cargando datos...")
-    book_loader = cargar_data(book_details_path)
-    books_data = book_loader.load_csv()
-    books_data = book_loader.clean_csv()
-
-    reviews_loader = cargar_data(reviews_path)
-    reviews_data = reviews_loader.load_csv()
-    reviews_data = reviews_loader.clean_csv()
-
-    # Detectar anomalías
-    print("\nDetectando anomalías en los datos de valoraciones...")
-    anomalies_books = book_loader.detect_outliers("ratingsCount")
-    anomalies_reviews = reviews_loader.detect_outliers("review/score")
-
-    # === Módulo de Análisis de Sentimientos ===
-    print("\nRealizando análisis de sentimientos...")
-    sentiment_analyzer = SentimentAnalysis()
-    reviews_data["sentiment"] = sentiment_analyzer.analyze_sentiments(reviews_data["review/text"])
-
-    # === Módulo de Análisis ===
-    print("\nGenerando métricas y estadísticas...")
-    data_analyzer = ExploratoryAnalysis(books_data, reviews_data)
-    top_books_by_reviews = data_analyzer.top_books_by_reviews(10)
-    top_books_by_rating = data_analyzer.top_books_by_rating(10)
-    top_books_by_sentiment = data_analyzer.top_books_by_sentiment(10)
-
-    # === Módulo de Visualización ===
-    print("\nGenerando visualizaciones...")
-    visualizer = DataVisualization()
-    visualizer.plot_top_books(top_books_by_reviews, title="Top 10 libros por número de reseñas")
-    visualizer.plot_top_books(top_books_by_rating, title="Top 10 libros por puntaje promedio")
-    visualizer.plot_top_books(top_books_by_sentiment, title="Top 10 libros por sentimiento promedio")
+def main(force=()):
+    # El pipeline (etapas, dependencias y rutas) se declara en config.json.
+    # Las etapas sin cambios desde la última ejecución se omiten.
+    runner = PipelineRunner("./src/static/config.json")
+    status = runner.run(force=force)
+    if any(state not in ("omitida", "ejecutada") for state in status.values()):
+        print("\nEl pipeline terminó con etapas fallidas:")
+        print({name: state for name, state in status.items() if state != "ejecutada"})
+        return
 
     # Mostrar resultados finales
+    rankings = runner.output("rankings")
     print("\nResultados:")
     print("Top 10 libros por número de reseñas:")
-    print(top_books_by_reviews)
-    print("\nTop 10 libros por puntaje promedio:")
-    print(top_books_by_rating)
-    print("\nTop 10 libros por sentimiento promedio:")
-    print(top_books_by_sentiment)
+    print(rankings["review_count"])
+    # Con `bayesian` en la etapa `rankings`, el orden es por el promedio
+    # bayesiano (columna `bayesian_*`); la columna del promedio es el simple.
+    adjusted = "bayesian_average_rating" in rankings["average_rating"].columns
+    label = "promedio bayesiano" if adjusted else "promedio"
+    print(f"\nTop 10 libros por puntaje {label}:")
+    print(rankings["average_rating"])
+    print(f"\nTop 10 libros por sentimiento {label}:")
+    print(rankings["average_sentiment"])
+    print("\nLibros en tendencia en los últimos 90 días:")
+    print(runner.output("trends"))
+    print("\nCategorías en tendencia en los últimos 90 días:")
+    print(runner.output("category_trends"))
+    print(f"\nAnomalías en ratingsCount: {len(runner.output('book_outliers'))}")
+    for column, result in runner.output("review_outliers").items():
+        print(f"Anomalías en {column}: {len(result['indices'])}")
+    print("\nGráficos generados:")
+    for name in ("plot_top_authors", "plot_top_books", "plot_sentiment"):
+        print(f"  {runner.output(name)}")
+
+    PROFILER.print_summary()
 
 if __name__ == "__main__":
-    main()
+    # python main.py [etapa ...] fuerza la reejecución de esas etapas.
+    main(force=sys.argv[1:])
@@ -1,7 +1,15 @@
 """ Init module """
 
+from .agregados import BookAggregateStore
 from .analisis_exp import ExploratoryAnalysis
-from .analisis_NLP import SentimentAnalysis
+from .analisis_NLP import SentimentAnalysis, SentimentScoringEngine
+from .cache_sentimientos import SentimentCache
 from .cargar_data import cargar_data
+from .duplicados import NearDuplicateDetector
+from .indice_invertido import InvertedIndex
+from .indice_titulos import TitleIndex
+from .instantanea import StatsSnapshot
+from .lexicon_polaridad import LexiconPolarityScorer
+from .series_tiempo import TimeSeriesAnalysis, TimeSeriesStore
 from .top_libros import TopBooksAnalysis
 from .visualizacion import DataVisualization
@@ -0,0 +1,208 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+METRICS = ("rating", "sentiment")
+_SUM_FIELDS = ["review_count"] + [
+    f"{metric}_{field}" for metric in METRICS for field in ("count", "sum", "sumsq")
+]
+_MIN_FIELDS = [f"{metric}_min" for metric in METRICS]
+_MAX_FIELDS = [f"{metric}_max" for metric in METRICS]
+AGGREGATE_COLUMNS = _SUM_FIELDS + _MIN_FIELDS + _MAX_FIELDS
+
+
+def _combine(grouped) -> pd.DataFrame:
+    """
+    Combina estadísticas agrupadas: suma conteos y sumas, y toma el
+    mínimo y el máximo de los extremos.
+    """
+    combined = grouped[_SUM_FIELDS].sum()
+    combined[_MIN_FIELDS] = grouped[_MIN_FIELDS].min()
+    combined[_MAX_FIELDS] = grouped[_MAX_FIELDS].max()
+    return combined[AGGREGATE_COLUMNS]
+
+
+class BookAggregateStore:
+    """
+    Almacén de estadísticas agregadas por libro (conteo, suma, suma de
+    cuadrados, mínimo y máximo de puntaje y sentimiento).
+
+    Todas las estadísticas son combinables, así que el almacén puede
+    construirse por bloques, fusionarse entre particiones y actualizarse
+    con un lote nuevo de reseñas sin volver a recorrer las anteriores.
+
+    Attributes:
+        stats (pd.DataFrame): Estadísticas indexadas por `book_title`.
+    """
+    def __init__(self, stats: pd.DataFrame = None):
+        """
+        Args:
+            stats (pd.DataFrame, optional): Estadísticas ya calculadas. Por defecto,
+                un almacén vacío.
+        """
+        if stats is None:
+            stats = pd.DataFrame(
+                columns=AGGREGATE_COLUMNS, index=pd.Index([], name="book_title"), dtype="float64"
+            )
+        self.stats = stats
+
+    @classmethod
+    def from_frame(
+        cls,
+        data: pd.DataFrame,
+        book_column: str = "book_title",
+        rating_column: str = "rating",
+        sentiment_column: str = "sentiment",
+    ):
+        """
+        Calcula las estadísticas parciales de un bloque de reseñas.
+
+        Args:
+            data (pd.DataFrame): Reseñas del bloque.
+            book_column (str): Columna con el título del libro.
+            rating_column (str): Columna con el puntaje. Puede no existir.
+            sentiment_column (str): Columna con el sentimiento. Puede no existir.
+
+        Returns:
+            BookAggregateStore: Almacén con las estadísticas del bloque.
+
+        Raises:
+            ValueError: Si `book_column` no existe en los datos.
+        """
+        if book_column not in data.columns:
+            raise ValueError(f"La columna '{book_column}' no existe en el DataFrame.")
+        values = pd.DataFrame({"book_title": data[book_column].astype(str)})
+        aggregations = {"review_count": ("book_title", "size")}
+        for metric, column in zip(METRICS, (rating_column, sentiment_column)):
+            if column not in data.columns:
+                continue
+            values[metric] = data[column].astype("float64")
+            values[f"{metric}_sq"] = values[metric] ** 2
+            aggregations.update({
+                f"{metric}_count": (metric, "count"),
+                f"{metric}_sum": (metric, "sum"),
+                f"{metric}_sumsq": (f"{metric}_sq", "sum"),
+                f"{metric}_min": (metric, "min"),
+                f"{metric}_max": (metric, "max"),
+            })
+        stats = values.groupby("book_title", sort=False).agg(**aggregations)
+        return cls(stats.reindex(columns=AGGREGATE_COLUMNS).astype("float64"))
+
+    def merge(self, other: "BookAggregateStore") -> "BookAggregateStore":
+        """
+        Fusiona las estadísticas de otro almacén (otra partición o un lote
+        nuevo) con las de este.
+
+        Args:
+            other (BookAggregateStore): Almacén a fusionar.
+
+        Returns:
+            BookAggregateStore: Este almacén, actualizado.
+        """
+        if other.stats.empty:
+            return self
+        if self.stats.empty:
+            self.stats = other.stats.copy()
+            return self
+        self.stats = _combine(pd.concat([self.stats, other.stats]).groupby(level=0, sort=False))
+        self.stats.index.name = "book_title"
+        return self
+
+    def rollup(self, keys: pd.Series, name: str) -> "BookAggregateStore":
+        """
+        Reagrupa las estadísticas por otra llave (autor, categoría, título
+        normalizado, ...). Como son combinables, no hace falta volver a
+        recorrer las reseñas.
+
+        Args:
+            keys (pd.Series): Llave de cada libro, indexada por `book_title`.
+                Un título puede repetirse para sumar el libro a varias llaves
+                (p. ej. a cada uno de sus autores). Los libros sin llave (nula
+                o ausente) se descartan.
+            name (str): Nombre de la llave en el nuevo almacén.
+
+        Returns:
+            BookAggregateStore: Almacén indexado por la nueva llave.
+        """
+        positions = self.stats.index.get_indexer(keys.index)
+        found = (positions >= 0) & keys.notna().to_numpy()
+        stats = _combine(self.stats.iloc[positions[found]].groupby(keys.to_numpy()[found], sort=False))
+        stats.index.name = name
+        return type(self)(stats)
+
+    def update(self, data: pd.DataFrame, **columns) -> "BookAggregateStore":
+        """
+        Incorpora un lote nuevo de reseñas en O(tamaño del lote).
+
+        Args:
+            data (pd.DataFrame): Reseñas nuevas.
+            **columns: Nombres de columnas, como en `from_frame`.
+
+        Returns:
+            BookAggregateStore: Este almacén, actualizado.
+        """
+        return self.merge(self.from_frame(data, **columns))
+
+    def save(self, path: str):
+        """
+        Guarda las estadísticas en un archivo Parquet.
+
+        Args:
+            path (str): Ruta de destino.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.stats.to_parquet(path)
+        print(f"Agregados por libro guardados en {path}")
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Carga estadísticas guardadas con `save`.
+
+        Args:
+            path (str): Ruta del archivo Parquet.
+
+        Returns:
+            BookAggregateStore: Almacén cargado, o uno vacío si el archivo no existe.
+        """
+        if not os.path.exists(path):
+            print(f"Aviso: No existen agregados en {path}; se inicia un almacén vacío.")
+            return cls()
+        return cls(pd.read_parquet(path))
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Deriva promedios y desviaciones estándar de las estadísticas.
+
+        Returns:
+            pd.DataFrame: Columnas `book_title` (o la llave de `rollup`), `review_count`,
+                          `average_rating`, `rating_std`, `average_sentiment` y `sentiment_std`.
+        """
+        summary = pd.DataFrame({"review_count": self.stats["review_count"].astype("int64")})
+        for metric in METRICS:
+            count = self.stats[f"{metric}_count"].replace(0, np.nan)
+            mean = self.stats[f"{metric}_sum"] / count
+            variance = (self.stats[f"{metric}_sumsq"] / count - mean ** 2).clip(lower=0)
+            summary[f"average_{metric}"] = mean
+            summary[f"{metric}_std"] = np.sqrt(variance)
+        return summary.reset_index()
+
+    def top_n(self, column: str, top_n: int = 10) -> pd.DataFrame:
+        """
+        Devuelve los `top_n` libros con mayor valor en una columna de `summary`.
+
+        Args:
+            column (str): Columna de `summary` por la cual ordenar.
+            top_n (int): Número de libros a devolver. Por defecto, 10.
+
+        Returns:
+            pd.DataFrame: Columnas `book_title` (o la llave de `rollup`) y `column`.
+        """
+        summary = self.summary()
+        return summary.nlargest(top_n, column)[[self.stats.index.name, column]]
+
+    def __len__(self):
+        return len(self.stats)
@@ -1,8 +1,113 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 from textblob import TextBlob
 import re
 import string
 
+from .cache_sentimientos import SentimentCache
+from .lexicon_polaridad import LexiconPolarityScorer
+from .perfilado import instrument
+
+DEFAULT_BATCH_SIZE = 2_000
+BACKENDS = ("textblob", "lexicon")
+# Tabla de traducción que elimina la puntuación ASCII en una sola pasada.
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
+
+def _score_batch(texts: list) -> list:
+    """
+    Puntúa un lote de textos con `SentimentAnalysis.analyze_sentiment`.
+    Vive a nivel de módulo para poder enviarse a procesos trabajadores.
+    """
+    return [SentimentAnalysis.analyze_sentiment(text) for text in texts]
+
+
+class SentimentScoringEngine:
+    """
+    Motor que calcula la polaridad de muchas reseñas dividiéndolas en
+    lotes y repartiéndolos en un `ProcessPoolExecutor`.
+
+    Los resultados se devuelven en el mismo orden de entrada. Con
+    `workers=1` los lotes se puntúan en el proceso actual, con puntajes
+    idénticos bit a bit a los del modo paralelo. El pool de procesos se
+    reutiliza entre llamadas hasta `close()` (o al salir del `with`).
+
+    Attributes:
+        workers (int): Número de procesos trabajadores.
+        batch_size (int): Número de reseñas por lote.
+        progress (bool): Si se informa el avance por consola.
+    """
+    def __init__(self, workers: int = None, batch_size: int = DEFAULT_BATCH_SIZE, progress: bool = True):
+        """
+        Args:
+            workers (int, optional): Número de procesos. Por defecto, `os.cpu_count()`.
+            batch_size (int): Número de reseñas por lote. Por defecto, 2000.
+            progress (bool): Si se informa el avance por consola. Por defecto, True.
+
+        Raises:
+            ValueError: Si `workers` o `batch_size` no son positivos.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1 or batch_size < 1:
+            raise ValueError("'workers' y 'batch_size' deben ser enteros positivos.")
+        self.batch_size = batch_size
+        self.progress = progress
+        self._executor = None
+
+    def _batches(self, texts: list):
+        for start in range(0, len(texts), self.batch_size):
+            yield texts[start:start + self.batch_size]
+
+    def score(self, texts) -> list:
+        """
+        Calcula la polaridad de cada texto.
+
+        Args:
+            texts (Iterable[str]): Textos a puntuar.
+
+        Returns:
+            list: Puntajes de sentimiento en el mismo orden que `texts`.
+        """
+        texts = list(texts)
+        total = len(texts)
+        scores = []
+        if self.workers == 1 or total <= self.batch_size:
+            results = map(_score_batch, self._batches(texts))
+            for batch_scores in results:
+                scores.extend(batch_scores)
+                self._report(len(scores), total)
+            return scores
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        for batch_scores in self._executor.map(_score_batch, self._batches(texts)):
+            scores.extend(batch_scores)
+            self._report(len(scores), total)
+        return scores
+
+    def close(self):
+        """
+        Libera los procesos trabajadores. El motor puede reutilizarse:
+        el pool se vuelve a crear en la siguiente llamada a `score`.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _report(self, done: int, total: int):
+        if self.progress:
+            print(f"Sentimientos calculados: {done}/{total} reseñas", end="\r" if done < total else "\n")
+
 
 class SentimentAnalysis:
     """
@@ -12,8 +117,11 @@ class SentimentAnalysis:
         dataframe (pd.DataFrame): DataFrame que contiene las reseñas.
         text_column (str): Nombre de la columna con el texto de las reseñas.
         sentiment_column (str): Nombre de la columna donde se guardarán los puntajes de sentimiento.
+        backend (str): Motor de puntuación: "textblob" o "lexicon".
     """
-    def __init__(self, dataframe: pd.DataFrame, text_column: str = "review/text"):
+    _lexicon_scorer = None
+
+    def __init__(self, dataframe: pd.DataFrame, text_column: str = "review/text", backend: str = "textblob"):
         """
         Inicializa el módulo con el DataFrame y la columna de texto.
 
@@ -21,10 +129,31 @@ class SentimentAnalysis:
             dataframe (pd.DataFrame): DataFrame que contiene las reseñas.
             text_column (str): Nombre de la columna con el texto de las reseñas. 
                                Por defecto es "review/text".
+            backend (str): "textblob" puntúa cada reseña con TextBlob; "lexicon"
+                           usa `LexiconPolarityScorer`, vectorizado sobre toda la
+                           columna. Por defecto es "textblob".
+
+        Raises:
+            ValueError: Si `backend` no es uno de los motores soportados.
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend '{backend}' no soportado. Opciones: {BACKENDS}.")
         self.dataframe = dataframe
         self.text_column = text_column
         self.sentiment_column = "sentiment_score"
+        self.backend = backend
+
+    @classmethod
+    def lexicon_scorer(cls) -> LexiconPolarityScorer:
+        """
+        Devuelve el puntuador léxico compartido, compilándolo la primera vez.
+
+        Returns:
+            LexiconPolarityScorer: Puntuador léxico.
+        """
+        if cls._lexicon_scorer is None:
+            cls._lexicon_scorer = LexiconPolarityScorer()
+        return cls._lexicon_scorer
 
     @staticmethod
     def clean_text(text: str) -> str:
@@ -45,12 +174,43 @@ class SentimentAnalysis:
         # Eliminando espacios extras al inicio y final de la reseña
         return text
 
-    def preprocess_reviews(self):
+    @staticmethod
+    def normalize_texts(texts: pd.Series) -> pd.Series:
+        """
+        Versión por lotes de `clean_text` para una columna completa.
+
+        Usa una tabla de traducción precompilada para la puntuación y
+        `split`/`join` para colapsar espacios, en una sola pasada por
+        reseña y sin expresiones regulares. El resultado es idéntico al
+        de aplicar `clean_text` fila por fila.
+
+        Args:
+            texts (pd.Series): Columna con los textos originales.
+
+        Returns:
+            pd.Series: Textos limpios, con el mismo índice.
+        """
+        return pd.Series(
+            [
+                " ".join(text.lower().translate(PUNCTUATION_TABLE).split())
+                for text in texts.astype(str).tolist()
+            ],
+            index=texts.index,
+            dtype=object,
+        )
+
+    @instrument()
+    def preprocess_reviews(self, output_column: str = None):
         """
         Preprocesa el texto de las reseñas aplicando limpieza.
 
         Limpia la columna de texto especificada en `text_column` y actualiza el DataFrame.
 
+        Args:
+            output_column (str, optional): Columna donde escribir el texto limpio en lugar
+                de sobrescribir `text_column`. Si se indica, pasa a ser la nueva
+                `text_column` para los pasos siguientes.
+
         Raises:
             ValueError: Si la columna especificada en `text_column` no existe en el DataFrame.
         """
@@ -58,9 +218,12 @@ class SentimentAnalysis:
             raise ValueError(
                 f"La columna '{self.text_column}' no existe en el DataFrame."
             )
-        self.dataframe[self.text_column] = (
-            self.dataframe[self.text_column].astype(str).apply(self.clean_text)
-        )
+        cleaned = self.normalize_texts(self.dataframe[self.text_column])
+        if output_column is None:
+            self.dataframe[self.text_column] = cleaned
+        else:
+            self.dataframe[output_column] = cleaned
+            self.text_column = output_column
 
     @staticmethod
     def analyze_sentiment(text: str) -> float:
@@ -76,23 +239,63 @@ class SentimentAnalysis:
         blob = TextBlob(text)
         return blob.sentiment.polarity
 
-    def calculate_sentiments(self):
+    def score_texts(self, texts: list, engine: SentimentScoringEngine = None) -> list:
+        """
+        Puntúa una lista de textos con el backend configurado.
+
+        Args:
+            texts (list): Textos a puntuar.
+            engine (SentimentScoringEngine, optional): Motor paralelo para el
+                backend "textblob". Se ignora con el backend "lexicon".
+
+        Returns:
+            list: Puntajes en el mismo orden que `texts`.
+        """
+        if self.backend == "lexicon":
+            return self.lexicon_scorer().score(texts).tolist()
+        if engine is None:
+            return [self.analyze_sentiment(text) for text in texts]
+        return engine.score(texts)
+
+    @instrument()
+    def calculate_sentiments(self, engine: SentimentScoringEngine = None, cache: SentimentCache = None):
         """
         Calcula el puntaje de sentimiento para cada reseña en el DataFrame.
 
         Utiliza el método `analyze_sentiment` y crea una nueva columna en el DataFrame
-        para almacenar los resultados (`sentiment_score`).
+        para almacenar los resultados (`sentiment_score`). Los textos repetidos
+        se puntúan una sola vez y el resultado se propaga a todas sus filas.
+
+        Args:
+            engine (SentimentScoringEngine, optional): Motor para puntuar las reseñas
+                por lotes en paralelo. Por defecto se puntúan en el proceso actual.
+                Se ignora con el backend "lexicon".
+            cache (SentimentCache, optional): Caché persistente consultada antes de
+                puntuar; sólo los textos nuevos se puntúan y se guardan.
         """
-        self.dataframe[self.sentiment_column] = self.dataframe[self.text_column].apply(
-            self.analyze_sentiment
+        codes, uniques = pd.factorize(self.dataframe[self.text_column].astype(str))
+        uniques = uniques.tolist()
+        if cache is None:
+            unique_scores = self.score_texts(uniques, engine)
+        else:
+            unique_scores = cache.score(
+                uniques, lambda texts: self.score_texts(texts, engine), namespace=self.backend
+            )
+        self.dataframe[self.sentiment_column] = pd.Series(
+            np.asarray(unique_scores, dtype="float64")[codes],
+            index=self.dataframe.index,
         )
 
-    def average_sentiment_by(self, group_column: str) -> pd.DataFrame:
+    @instrument()
+    def average_sentiment_by(self, group_column: str, rows=None) -> pd.DataFrame:
         """
         Calcula el promedio del sentimiento agrupado por una columna específica.
 
         Args:
             group_column (str): Nombre de la columna por la cual agrupar (ej. "book_title" o "category").
+            rows (np.ndarray, optional): Posiciones de fila a considerar, p. ej. los ids
+                devueltos por `InvertedIndex.search` sobre estas mismas reseñas. Por
+                defecto, todas.
 
         Returns:
             pd.DataFrame: DataFrame con el promedio de sentimiento por grupo.
@@ -102,9 +305,56 @@ class SentimentAnalysis:
         """
         if group_column not in self.dataframe.columns:
             raise ValueError(f"La columna '{group_column}' no existe en el DataFrame.")
+        data = self.dataframe if rows is None else self.dataframe.take(rows)
         return (
-            self.dataframe.groupby(group_column)[self.sentiment_column]
+            data.groupby(group_column)[self.sentiment_column]
             .mean()
             .reset_index()
             .rename(columns={self.sentiment_column: "average_sentiment"})
         )
+
+    def compare_backends(self, sample_size: int = 5_000, seed: int = 0) -> dict:
+        """
+        Compara los backends "textblob" y "lexicon" sobre una muestra de
+        reseñas para juzgar el compromiso entre exactitud y velocidad.
+
+        Args:
+            sample_size (int): Número de reseñas a muestrear. Por defecto, 5000.
+            seed (int): Semilla del muestreo. Por defecto, 0.
+
+        Returns:
+            dict: Reporte con el tamaño de la muestra, error absoluto medio,
+                  correlación de Pearson, acuerdo de signo, reseñas por
+                  segundo de cada backend y la aceleración obtenida.
+
+        Raises:
+            ValueError: Si la columna especificada en `text_column` no existe en el DataFrame.
+        """
+        if self.text_column not in self.dataframe.columns:
+            raise ValueError(f"La columna '{self.text_column}' no existe en el DataFrame.")
+        texts = self.dataframe[self.text_column].astype(str)
+        texts = texts.sample(min(sample_size, len(texts)), random_state=seed).tolist()
+
+        start = time.perf_counter()
+        textblob_scores = np.array([self.analyze_sentiment(text) for text in texts])
+        textblob_seconds = time.perf_counter() - start
+
+        scorer = self.lexicon_scorer()
+        start = time.perf_counter()
+        lexicon_scores = scorer.score(texts)
+        lexicon_seconds = time.perf_counter() - start
+
+        n = len(texts)
+        report = {
+            "sample_size": n,
+            "mean_absolute_error": float(np.abs(textblob_scores - lexicon_scores).mean()) if n else 0.0,
+            "pearson": float(np.corrcoef(textblob_scores, lexicon_scores)[0, 1]) if n > 1 else float("nan"),
+            "sign_agreement": float((np.sign(textblob_scores) == np.sign(lexicon_scores)).mean()) if n else 0.0,
+            "textblob_rows_per_sec": n / textblob_seconds if textblob_seconds else float("inf"),
+            "lexicon_rows_per_sec": n / lexicon_seconds if lexicon_seconds else float("inf"),
+        }
+        report["speedup"] = report["lexicon_rows_per_sec"] / report["textblob_rows_per_sec"]
+        print("Comparación de backends de sentimiento:")
+        for key, value in report.items():
+            print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+        return report
@@ -1,5 +1,9 @@
 import pandas as pd
 
+from .agregados import BookAggregateStore
+from .columnas_lista import LIST_COLUMNS, entity_counts, explode_list_column
+from .perfilado import instrument
+
 
 class ExploratoryAnalysis:
     """
@@ -7,16 +11,33 @@ class ExploratoryAnalysis:
 
     Attributes:
         data (pd.DataFrame): DataFrame que contiene los datos a analizar.
+        store (BookAggregateStore): Agregados por libro precalculados, opcional.
+        lists (dict): Columna de listas (`authors`, `categories`) → tabla
+            libro ↔ entidad de `explode_list_column`.
     """
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, store: BookAggregateStore = None, lists: dict = None):
         """
         Constructor para inicializar el DataFrame de análisis.
 
         Args:
             data (pd.DataFrame): DataFrame que contiene los datos a analizar.
+            store (BookAggregateStore, optional): Agregados por libro precalculados.
+            lists (dict, optional): Tablas libro ↔ entidad ya calculadas (p. ej. con
+                `cargar_data.load_list_table`); las que falten se calculan desde `data`.
         """
         self.data = data
+        self.store = store
+        self.lists = dict(lists or {})
+
+    def _list_table(self, column: str):
+        """
+        Tabla libro ↔ entidad de `column`, o None si no hay datos para ella.
+        """
+        if column not in self.lists and column in self.data.columns:
+            self.lists[column] = explode_list_column(self.data[column], LIST_COLUMNS[column])
+        return self.lists.get(column)
 
+    @instrument()
     def average_ratings_by_book(self):
         """
         Calcula el promedio de valoraciones por libro.
@@ -27,6 +48,10 @@ class ExploratoryAnalysis:
             pd.DataFrame: DataFrame con las columnas `book_title` y `average_rating`.
             Devuelve None si faltan las columnas necesarias.
         """
+        if self.store is not None:
+            avg_ratings = self.store.summary()[["book_title", "average_rating"]]
+            print("Valoraciones promedio calculadas por libro.")
+            return avg_ratings
         if "book_title" in self.data.columns and "rating" in self.data.columns:
             avg_ratings = self.data.groupby("book_title")["rating"].mean().reset_index()
             avg_ratings.rename(columns={"rating": "average_rating"}, inplace=True)
@@ -55,18 +80,28 @@ class ExploratoryAnalysis:
         )
         return {"total_reviews": total_reviews, "total_ratings": total_ratings}
 
+    @instrument()
     def most_popular_authors(self, top_n=10):
         """
         Identifica los autores más populares basándose en la cantidad de libros o reseñas.
 
+        Con la columna de listas `authors`, cuenta los libros de cada autor:
+        un libro con varios autores suma uno a cada uno.
+
         Args:
             top_n (int, optional): Número de autores más populares a devolver. 
                                    Por defecto es 10.
 
         Returns:
             pd.DataFrame: DataFrame con las columnas `author` y `count`, 
-                          ordenado por popularidad. Devuelve None si falta la columna `author`.
+                          ordenado por popularidad. Devuelve None si faltan las columnas
+                          `authors` y `author`.
         """
+        table = self._list_table("authors")
+        if table is not None:
+            popular_authors = entity_counts(table, "author", top_n).reset_index()
+            print(f"Top {top_n} autores más populares calculados.")
+            return popular_authors
         if "author" in self.data.columns:
             popular_authors = (
                 self.data["author"].value_counts().head(top_n).reset_index()
@@ -78,18 +113,28 @@ class ExploratoryAnalysis:
             print("Error: La columna 'author' no se encuentra en los datos.")
             return None
 
+    @instrument()
     def most_reviewed_categories(self, top_n=10):
         """
         Identifica los géneros o categorías más reseñados.
 
+        Con la columna de listas `categories`, cuenta los libros de cada
+        categoría individual.
+
         Args:
             top_n (int, optional): Número de categorías populares a devolver. 
                                    Por defecto es 10.
 
         Returns:
             pd.DataFrame: DataFrame con las columnas `category` y `count`, 
-                          ordenado por popularidad. Devuelve None si falta la columna `category`.
+                          ordenado por popularidad. Devuelve None si faltan las columnas
+                          `categories` y `category`.
         """
+        table = self._list_table("categories")
+        if table is not None:
+            popular_categories = entity_counts(table, "category", top_n).reset_index()
+            print(f"Top {top_n} géneros/categorías más reseñadas calculadas.")
+            return popular_categories
         if "category" in self.data.columns:
             popular_categories = (
                 self.data["category"].value_counts().head(top_n).reset_index()
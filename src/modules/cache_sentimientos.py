@@ -0,0 +1,218 @@
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = "./src/data/cache/sentiments.sqlite"
+DEFAULT_MAX_ENTRIES = 20_000_000
+DEFAULT_LRU_SIZE = 200_000
+_SQL_BATCH = 500
+
+
+class SentimentCache:
+    """
+    Caché persistente de puntajes de sentimiento indexada por el hash del
+    texto limpio. Combina una LRU en memoria con una tabla SQLite en disco
+    y mantiene contadores de aciertos y fallos.
+
+    Los puntajes se guardan por `namespace` (el backend que los calculó),
+    para que los resultados de TextBlob y del léxico no se mezclen.
+
+    Attributes:
+        path (str): Ruta del archivo SQLite.
+        max_entries (int): Número máximo de entradas en disco; al superarlo
+                           se eliminan las menos usadas recientemente.
+        lru_size (int): Número máximo de entradas en la LRU en memoria.
+        hits (int): Textos resueltos desde la caché (memoria o disco).
+        misses (int): Textos que tuvieron que puntuarse.
+    """
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        lru_size: int = DEFAULT_LRU_SIZE,
+    ):
+        """
+        Abre (o crea) la base SQLite de la caché.
+
+        Args:
+            path (str): Ruta del archivo SQLite.
+            max_entries (int): Tope de entradas en disco.
+            lru_size (int): Tope de entradas en memoria.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.lru_size = lru_size
+        self.hits = 0
+        self.misses = 0
+        self._lru = OrderedDict()
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment ("
+            " namespace TEXT NOT NULL, key BLOB NOT NULL, score REAL NOT NULL,"
+            " last_used INTEGER NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS sentiment_last_used ON sentiment (last_used)"
+        )
+        self._connection.commit()
+        # Se cuenta una sola vez al abrir y después se lleva el total a mano:
+        # un COUNT(*) recorre la tabla completa.
+        self._count = self._connection.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+
+    @staticmethod
+    def text_key(text: str) -> bytes:
+        """
+        Llave de 128 bits del texto limpio.
+
+        Args:
+            text (str): Texto de la reseña ya limpio.
+
+        Returns:
+            bytes: Hash BLAKE2b del texto.
+        """
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _remember(self, namespace: str, key: bytes, score: float):
+        self._lru[(namespace, key)] = score
+        self._lru.move_to_end((namespace, key))
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys: list, namespace: str) -> dict:
+        """
+        Busca varias llaves, primero en memoria y luego en disco.
+
+        Args:
+            keys (list): Llaves calculadas con `text_key`.
+            namespace (str): Backend que calculó los puntajes.
+
+        Returns:
+            dict: Llave → puntaje para las llaves encontradas.
+        """
+        found, pending = {}, []
+        for key in keys:
+            score = self._lru.get((namespace, key))
+            if score is None:
+                pending.append(key)
+            else:
+                self._lru.move_to_end((namespace, key))
+                found[key] = score
+
+        now = time.time_ns()
+        for start in range(0, len(pending), _SQL_BATCH):
+            batch = pending[start:start + _SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._connection.execute(
+                f"SELECT key, score FROM sentiment WHERE namespace = ? AND key IN ({placeholders})",
+                [namespace, *batch],
+            ).fetchall()
+            for key, score in rows:
+                found[key] = score
+                self._remember(namespace, key, score)
+            self._connection.executemany(
+                "UPDATE sentiment SET last_used = ? WHERE namespace = ? AND key = ?",
+                [(now, namespace, key) for key, _ in rows],
+            )
+        self._connection.commit()
+        return found
+
+    def put_many(self, items: dict, namespace: str):
+        """
+        Guarda puntajes nuevos y aplica el tope de tamaño eliminando las
+        entradas usadas menos recientemente.
+
+        Args:
+            items (dict): Llave → puntaje.
+            namespace (str): Backend que calculó los puntajes.
+        """
+        now = time.time_ns()
+        rows = [(namespace, key, float(score), now) for key, score in items.items()]
+        before = self._connection.total_changes
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO sentiment (namespace, key, score, last_used) VALUES (?, ?, ?, ?)", rows
+        )
+        inserted = self._connection.total_changes - before
+        if inserted < len(rows):
+            self._connection.executemany(
+                "UPDATE sentiment SET score = ?, last_used = ? WHERE namespace = ? AND key = ?",
+                [(score, used, ns, key) for ns, key, score, used in rows],
+            )
+        self._count += inserted
+        for key, score in items.items():
+            self._remember(namespace, key, float(score))
+
+        excess = self._count - self.max_entries
+        if excess > 0:
+            evicted = self._connection.execute(
+                "SELECT rowid, namespace, key FROM sentiment ORDER BY last_used LIMIT ?", (excess,)
+            ).fetchall()
+            self._connection.executemany(
+                "DELETE FROM sentiment WHERE rowid = ?", [(rowid,) for rowid, _, _ in evicted]
+            )
+            for _, evicted_namespace, key in evicted:
+                self._lru.pop((evicted_namespace, key), None)
+            self._count -= len(evicted)
+        self._connection.commit()
+
+    def score(self, texts: list, scorer, namespace: str) -> list:
+        """
+        Devuelve el puntaje de cada texto consultando la caché y llamando
+        a `scorer` sólo con los textos que no estaban guardados. Los
+        textos repetidos dentro del lote se puntúan una sola vez.
+
+        Args:
+            texts (list): Textos limpios.
+            scorer (Callable[[list], Iterable[float]]): Función que puntúa una lista de textos.
+            namespace (str): Backend que calcula los puntajes.
+
+        Returns:
+            list: Puntajes en el mismo orden que `texts`.
+        """
+        keys = [self.text_key(text) for text in texts]
+        unique = dict(zip(keys, texts))
+        found = self.get_many(list(unique), namespace)
+
+        missing = [key for key in unique if key not in found]
+        if missing:
+            scored = dict(zip(missing, scorer([unique[key] for key in missing])))
+            self.put_many(scored, namespace)
+            found.update(scored)
+
+        self.hits += len(unique) - len(missing)
+        self.misses += len(missing)
+        return [found[key] for key in keys]
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos y entradas en disco y memoria.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+            "memory_entries": len(self._lru),
+        }
+
+    def close(self):
+        """
+        Cierra la conexión con la base SQLite.
+        """
+        self._connection.close()
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,4 +1,139 @@
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .columnas_lista import LIST_COLUMNS, explode_list_column
+from .cuantiles import DEFAULT_ERROR, KLLSketch
+from .perfilado import instrument
+
+# Columnas y tipos usados al leer `books_rating.csv` por bloques. Los
+# ids de libro, títulos y usuarios se repiten millones de veces, por lo
+# que se leen como categóricas; el texto se guarda en Arrow y el puntaje
+# cabe en float32. Como el texto ocupa la mayor parte de cada bloque, el
+# ahorro frente a los tipos por defecto es de ~1.3x; la reducción de 3-5x
+# de `compact` se da en tablas con muchas columnas repetitivas como
+# `books_data.csv`.
+REVIEW_COLUMNS = ["Id", "Title", "User_id", "review/score", "review/time", "review/text"]
+REVIEW_DTYPES = {
+    "Id": "category",
+    "Title": "category",
+    "User_id": "category",
+    "review/score": "float32",
+    "review/time": "Int64",
+    "review/text": "string[pyarrow]",
+}
+DEFAULT_CHUNKSIZE = 100_000
+
+# Una columna de texto con menos de esta proporción de valores distintos se
+# compacta como categórica; las demás pasan a cadenas respaldadas por Arrow.
+CATEGORICAL_RATIO = 0.5
+
+# Versión de las reglas de limpieza; forma parte de la llave de la caché,
+# por lo que cambiarla invalida todas las cachés Parquet existentes.
+CLEANING_VERSION = 2
+DEFAULT_CACHE_DIR = "./src/data/cache"
+_FINGERPRINT_BYTES = 1 << 20
+
+
+def write_parquet(path: str, frames) -> bool:
+    """
+    Escribe un iterable de DataFrames a un único archivo Parquet, un row
+    group por bloque, sin materializarlos juntos. Las categóricas se fijan
+    a índices int32 para que todos los bloques compartan el mismo esquema.
+    El archivo se escribe con un nombre temporal y sólo se renombra si
+    el iterable se consumió sin errores; si falla, el temporal se borra.
+    ---------------------------------------------------------------
+    Args:
+        path (str): Ruta de destino.
+        frames (Iterable[pd.DataFrame]): Bloques a escribir.
+    ---------------------------------------------------------------
+    Returns:
+        bool: True si se escribió el archivo; False si no hubo bloques.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    writer = None
+    try:
+        for frame in frames:
+            if writer is None:
+                schema = pa.Schema.from_pandas(frame, preserve_index=False)
+                for i, field in enumerate(schema):
+                    if pa.types.is_dictionary(field.type):
+                        schema = schema.set(
+                            i, field.with_type(pa.dictionary(pa.int32(), pa.string()))
+                        )
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(
+                pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            )
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            writer = None
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        return False
+    os.replace(tmp_path, path)
+    print(f"Archivo Parquet escrito en {path}")
+    return True
+
+
+def iter_parquet(path: str, chunksize: int = DEFAULT_CHUNKSIZE, columns=None):
+    """
+    Lee un archivo Parquet por lotes (memory-mapped) como DataFrames.
+    ---------------------------------------------------------------
+    Args:
+        path (str): Ruta del archivo Parquet.
+        chunksize (int): Número de filas por lote.
+        columns (list, optional): Columnas a leer. Por defecto todas.
+    ---------------------------------------------------------------
+    Yields:
+        pd.DataFrame: Lotes del archivo.
+    """
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+        yield batch.to_pandas()
+
+
+def review_time_int32(chunk: pd.DataFrame, source: str = "") -> pd.DataFrame:
+    """
+    Convierte `review/time` a int32 verificando antes el rango, para que
+    un valor que no cabe no se trunque en silencio.
+    ---------------------------------------------------------------
+    Args:
+        chunk (pd.DataFrame): Bloque con la columna `review/time` sin nulos.
+        source (str): Origen del bloque, para el mensaje de error.
+    ---------------------------------------------------------------
+    Returns:
+        pd.DataFrame: El bloque con `review/time` en int32.
+    ---------------------------------------------------------------
+    Raises:
+        ValueError: Si algún valor está fuera del rango de int32. Todos
+            los bloques deben compartir el mismo esquema, así que la
+            columna no puede quedar en int64 sólo en algunos.
+    """
+    limits = np.iinfo(np.int32)
+    times = chunk["review/time"]
+    outside = ~times.between(limits.min, limits.max)
+    if outside.any():
+        raise ValueError(
+            f"'review/time' tiene {int(outside.sum())} valores fuera del rango de int32 "
+            f"(p. ej. {times[outside].iloc[0]}) en {source}"
+        )
+    return chunk.astype({"review/time": "int32"})
 
 
 class cargar_data:
@@ -8,11 +143,18 @@ class cargar_data:
     reseñas de los mismos por id de reseña.
     """
 
-    def __init__(self, file_path: str):
-        """ """
+    def __init__(self, file_path: str, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Args:
+            file_path (str): Ruta del archivo CSV.
+            cache_dir (str): Carpeta donde se guardan las cachés Parquet
+                             de los datos limpios.
+        """
         self.file_path = file_path
+        self.cache_dir = cache_dir
         self.data = None
 
+    @instrument()
     def load_csv(self):
         """
         Carga un archivo CSV desde la ruta especificada y lo almacena 
@@ -33,6 +175,7 @@ class cargar_data:
             print(f"Error: No se cargó el archivo CSV {e}")
         return self.data
 
+    @instrument()
     def clean_csv(self):
         """
         Limpia los datos cargados eliminando valores nulos y duplicados.
@@ -50,14 +193,394 @@ class cargar_data:
             null_values = self.data.isnull().sum()
             print(f"Valores nulos por columna: \n", null_values)
 
-            self.data.dropna(inplace=True)
+            # Nulos y duplicados se filtran con una sola máscara y una sola
+            # copia: una fila con nulos sólo puede repetir otra fila con nulos,
+            # así que el resultado es el mismo que dropna + drop_duplicates.
+            keep = self.data.notna().all(axis=1).to_numpy() & ~self.data.duplicated().to_numpy()
+            self.data = self.data.take(np.flatnonzero(keep))
             print("Datos limpiados: Valores nulos")
-            self.data.drop_duplicates(inplace=True)
             print("Datos limpiados: Valores duplicados")
         else:
             print(f"Error: Los datos del archivo CSV no fueron cargados en load_csv()")
         return self.data
 
+    @staticmethod
+    def compact_frame(data: pd.DataFrame, categorical_ratio: float = CATEGORICAL_RATIO) -> pd.DataFrame:
+        """
+        Devuelve una versión compacta del DataFrame:
+            - Columnas de texto con muchos valores repetidos (`Title`,
+              `User_id`, `profileName`, ...) pasan a categóricas, de modo
+              que cada cadena distinta se guarda una sola vez.
+            - El resto de columnas de texto pasan a `string[pyarrow]`,
+              sin un objeto de Python por fila.
+            - `review/time` pasa a segundos epoch en int32 (si cabe).
+            - Los enteros y flotantes se reducen al tipo más pequeño que
+              conserva sus valores (los flotantes, a float32).
+        ---------------------------------------------------------------
+        Args:
+            data (pd.DataFrame): Datos a compactar.
+            categorical_ratio (float): Proporción máxima de valores
+                distintos para convertir una columna a categórica.
+        ---------------------------------------------------------------
+        Returns:
+            pd.DataFrame: Nuevo DataFrame con los tipos compactos.
+        """
+        columns = {}
+        for name, column in data.items():
+            if name == "review/time":
+                if pd.api.types.is_datetime64_any_dtype(column):
+                    column = column.astype("int64") // 10**9
+                column = pd.to_numeric(column, errors="coerce")
+                if column.notna().all() and column.between(0, np.iinfo(np.int32).max).all():
+                    column = column.astype("int32")
+            elif isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.cat.remove_unused_categories()
+            elif pd.api.types.is_bool_dtype(column):
+                pass
+            elif pd.api.types.is_integer_dtype(column):
+                if column.notna().all():
+                    column = pd.to_numeric(column.astype("int64"), downcast="integer")
+            elif pd.api.types.is_float_dtype(column):
+                column = pd.to_numeric(column, downcast="float")
+            elif pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column):
+                distinct = column.nunique(dropna=True)
+                if distinct <= categorical_ratio * max(len(column), 1):
+                    column = column.astype("category")
+                else:
+                    column = column.astype("string[pyarrow]")
+            columns[name] = column
+        return pd.DataFrame(columns, index=data.index)
+
+    @staticmethod
+    def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compara la memoria (profunda) por columna de dos versiones de
+        los mismos datos.
+        ---------------------------------------------------------------
+        Returns:
+            pd.DataFrame: Por columna, tipo y MiB antes y después, y el
+            factor de reducción. La última fila es el total.
+        """
+        before_mb = before.memory_usage(deep=True, index=False) / 2**20
+        after_mb = after.memory_usage(deep=True, index=False) / 2**20
+        report = pd.DataFrame({
+            "dtype_before": before.dtypes.astype(str),
+            "dtype_after": after.dtypes.astype(str),
+            "mb_before": before_mb,
+            "mb_after": after_mb,
+        })
+        report.loc["total"] = ["", "", before_mb.sum(), after_mb.sum()]
+        report["reduction"] = report["mb_before"] / report["mb_after"]
+        return report.round({"mb_before": 2, "mb_after": 2, "reduction": 1})
+
+    @instrument()
+    def compact(self, categorical_ratio: float = CATEGORICAL_RATIO):
+        """
+        Compacta `self.data` con `compact_frame` e imprime la memoria
+        por columna antes y después.
+        ---------------------------------------------------------------
+        Args:
+            categorical_ratio (float): Ver `compact_frame`.
+        ---------------------------------------------------------------
+        Returns:
+            pd.DataFrame: Los datos compactados (también quedan en `self.data`).
+            Si no se han cargado datos, devuelve None.
+        """
+        if self.data is None:
+            print(f"Error: Los datos del archivo CSV no fueron cargados en load_csv()")
+            return None
+        compacted = self.compact_frame(self.data, categorical_ratio)
+        report = self.memory_report(self.data, compacted)
+        print(f"Memoria por columna (MiB):\n{report.to_string()}")
+        self.data = compacted
+        return self.data
+
+    def load_csv_chunks(self, chunksize: int = DEFAULT_CHUNKSIZE, usecols=None, dtype=None):
+        """
+        Lee el archivo CSV por bloques de tamaño fijo sin materializarlo
+        completo en memoria. A diferencia de `load_csv`, no guarda nada
+        en `self.data`: cada bloque se entrega al consumidor y se libera.
+        ---------------------------------------------------------------
+        Args:
+            chunksize (int): Número de filas por bloque.
+            usecols (list, optional): Columnas a leer. Por defecto todas.
+            dtype (dict, optional): Tipos explícitos por columna.
+        ---------------------------------------------------------------
+        Yields:
+            pd.DataFrame: Bloques de a lo sumo `chunksize` filas.
+        ---------------------------------------------------------------
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            Exception: Cualquier error de lectura se propaga, para que el
+                consumidor no procese un archivo truncado como completo.
+        """
+        try:
+            reader = pd.read_csv(self.file_path, chunksize=chunksize, usecols=usecols, dtype=dtype)
+        except FileNotFoundError:
+            print(f"Error: El archivo csv no fue encontrado en {self.file_path}")
+            raise
+        with reader:
+            print(f"Leyendo archivo CSV por bloques desde {self.file_path}")
+            yield from reader
+
+    @staticmethod
+    def clean_chunks(chunks, subset=None):
+        """
+        Aplica la limpieza de `clean_csv` de forma incremental sobre un
+        iterable de bloques. Los duplicados se detectan entre bloques
+        guardando únicamente el hash (uint64) de cada fila ya vista, de
+        modo que la memoria crece con el número de filas únicas y no con
+        el tamaño del archivo.
+        ---------------------------------------------------------------
+        Args:
+            chunks (Iterable[pd.DataFrame]): Bloques a limpiar.
+            subset (list, optional): Columnas que definen un duplicado.
+                                     Por defecto todas.
+        ---------------------------------------------------------------
+        Yields:
+            pd.DataFrame: Bloques sin nulos ni filas repetidas.
+        """
+        seen = np.empty(0, dtype=np.uint64)
+        total_nulls = 0
+        total_duplicates = 0
+        for chunk in chunks:
+            rows = len(chunk)
+            chunk = chunk.dropna()
+            total_nulls += rows - len(chunk)
+
+            keys = chunk if subset is None else chunk[subset]
+            hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+            is_new = ~pd.Index(hashes).duplicated() & ~np.isin(hashes, seen)
+            seen = np.union1d(seen, hashes[is_new])
+            total_duplicates += int((~is_new).sum())
+
+            if is_new.all():
+                yield chunk
+            elif is_new.any():
+                yield chunk.take(np.flatnonzero(is_new))
+        print(f"Datos limpiados: {total_nulls} filas con valores nulos")
+        print(f"Datos limpiados: {total_duplicates} filas duplicadas")
+
+    def stream_csv(
+        self, chunksize: int = DEFAULT_CHUNKSIZE, usecols=None, dtype=None, subset=None
+    ):
+        """
+        Modo de carga en streaming: combina `load_csv_chunks` y
+        `clean_chunks` para que las etapas posteriores consuman bloques
+        ya limpios como un generador. El pico de memoria queda acotado
+        por `chunksize` y no por el tamaño del archivo.
+        ---------------------------------------------------------------
+        Args:
+            chunksize (int): Número de filas por bloque.
+            usecols (list, optional): Columnas a leer. Por defecto todas.
+            dtype (dict, optional): Tipos explícitos por columna.
+            subset (list, optional): Columnas que definen un duplicado.
+        ---------------------------------------------------------------
+        Yields:
+            pd.DataFrame: Bloques limpios.
+        ---------------------------------------------------------------
+        Raises:
+            ValueError: Si `review/time` no cabe en int32 (ver `review_time_int32`).
+        """
+        chunks = self.load_csv_chunks(chunksize, usecols=usecols, dtype=dtype)
+        for chunk in self.clean_chunks(chunks, subset=subset):
+            if "review/time" in chunk.columns:
+                chunk = review_time_int32(chunk, self.file_path)
+            yield chunk
+
+    def _source_fingerprint(self) -> str:
+        """
+        Huella del archivo fuente: tamaño, fecha de modificación y hash
+        del primer y último MiB. Evita leer archivos de varios GB
+        completos y aun así detecta reemplazos con el mismo tamaño.
+        """
+        stat = os.stat(self.file_path)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        with open(self.file_path, "rb") as f:
+            digest.update(f.read(_FINGERPRINT_BYTES))
+            if stat.st_size > _FINGERPRINT_BYTES:
+                f.seek(max(stat.st_size - _FINGERPRINT_BYTES, _FINGERPRINT_BYTES))
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def cache_path(self, **options) -> str:
+        """
+        Ruta de la caché Parquet para el archivo y las opciones de
+        limpieza dadas. La llave combina la huella del archivo fuente,
+        `CLEANING_VERSION` y las opciones, así que una caché obsoleta
+        simplemente no coincide con la ruta calculada.
+        ---------------------------------------------------------------
+        Args:
+            **options: Opciones de lectura/limpieza (columnas, tipos, ...).
+        ---------------------------------------------------------------
+        Returns:
+            str: Ruta del archivo Parquet.
+        """
+        options = dict(options, cleaning_version=CLEANING_VERSION)
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        stem = os.path.splitext(os.path.basename(self.file_path))[0]
+        return os.path.join(
+            self.cache_dir,
+            f"{stem}-{self._source_fingerprint()[:16]}-{digest.hexdigest()}.parquet",
+        )
+
+    def invalidate_cache(self):
+        """
+        Elimina todas las cachés Parquet asociadas al archivo fuente,
+        sin importar las opciones con que fueron generadas.
+        """
+        stem = os.path.splitext(os.path.basename(self.file_path))[0]
+        for path in glob.glob(os.path.join(self.cache_dir, f"{stem}-*.parquet")):
+            os.remove(path)
+            print(f"Caché eliminada: {path}")
+
+    def _write_cache(self, path: str, frames):
+        """
+        Escribe la caché con `write_parquet` y, sólo si se completó,
+        elimina las cachés de versiones anteriores del archivo fuente,
+        que ya no sirven. Un error de lectura se propaga sin dejar una
+        caché parcial.
+        """
+        write_parquet(path, frames)
+        current = os.path.basename(path).rsplit("-", 1)[0]
+        stem = os.path.splitext(os.path.basename(self.file_path))[0]
+        for stale in glob.glob(os.path.join(self.cache_dir, f"{stem}-*.parquet")):
+            if not os.path.basename(stale).startswith(f"{current}-"):
+                os.remove(stale)
+
+    @instrument()
+    def load_cached(self, columns=None, rebuild: bool = False):
+        """
+        Carga los datos limpios desde la caché Parquet. Si la caché no
+        existe, está obsoleta o se pide `rebuild`, ejecuta `load_csv` y
+        `clean_csv` y guarda el resultado para las siguientes ejecuciones.
+        ---------------------------------------------------------------
+        Args:
+            columns (list, optional): Columnas a devolver. Por defecto todas.
+            rebuild (bool): Fuerza la reconstrucción de la caché.
+        ---------------------------------------------------------------
+        Returns:
+            pd.DataFrame: Datos limpios (también quedan en `self.data`).
+            Si ocurre un error al cargar el CSV, devuelve None.
+        """
+        try:
+            path = self.cache_path(mode="full")
+        except FileNotFoundError:
+            print(f"Error: El archivo csv no fue encontrado en {self.file_path}")
+            return None
+
+        if rebuild or not os.path.exists(path):
+            if self.load_csv() is None:
+                return None
+            self._write_cache(path, [self.clean_csv()])
+            if columns is not None:
+                self.data = self.data[columns]
+            return self.data
+
+        self.data = pd.read_parquet(path, columns=columns, memory_map=True)
+        print(f"Datos limpios cargados desde la caché {path}")
+        return self.data
+
+    def stream_cached(
+        self,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        usecols=None,
+        dtype=None,
+        subset=None,
+        columns=None,
+        rebuild: bool = False,
+    ):
+        """
+        Versión en streaming de `load_cached`. La primera vez construye
+        la caché consumiendo `stream_csv` bloque a bloque; después lee la
+        caché por lotes (memory-mapped) sólo con las columnas pedidas.
+        ---------------------------------------------------------------
+        Args:
+            chunksize (int): Número de filas por bloque.
+            usecols (list, optional): Columnas a leer del CSV.
+            dtype (dict, optional): Tipos explícitos por columna.
+            subset (list, optional): Columnas que definen un duplicado.
+            columns (list, optional): Columnas a devolver de la caché.
+            rebuild (bool): Fuerza la reconstrucción de la caché.
+        ---------------------------------------------------------------
+        Yields:
+            pd.DataFrame: Bloques limpios.
+        """
+        path = self.ensure_stream_cache(chunksize, usecols, dtype, subset, rebuild)
+        if path is None:
+            return
+        print(f"Leyendo datos limpios por bloques desde la caché {path}")
+        yield from iter_parquet(path, chunksize, columns)
+
+    def ensure_stream_cache(
+        self, chunksize: int = DEFAULT_CHUNKSIZE, usecols=None, dtype=None, subset=None, rebuild: bool = False
+    ):
+        """
+        Construye (si hace falta) la caché Parquet de `stream_cached` sin
+        leerla de vuelta, y devuelve su ruta.
+        ---------------------------------------------------------------
+        Args:
+            Los mismos que `stream_cached`.
+        ---------------------------------------------------------------
+        Returns:
+            str: Ruta de la caché, o None si el CSV no pudo cargarse.
+        """
+        try:
+            path = self.cache_path(mode="stream", usecols=usecols, dtype=dtype, subset=subset)
+        except FileNotFoundError:
+            print(f"Error: El archivo csv no fue encontrado en {self.file_path}")
+            return None
+
+        if rebuild or not os.path.exists(path):
+            self._write_cache(
+                path, self.stream_csv(chunksize, usecols=usecols, dtype=dtype, subset=subset)
+            )
+            if not os.path.exists(path):
+                return None
+        return path
+
+    @instrument()
+    def load_list_table(self, column: str, rebuild: bool = False):
+        """
+        Tabla libro ↔ entidad de una columna de listas en texto (`authors`
+        o `categories`) de `self.data`, construida con `explode_list_column`
+        y guardada junto a la caché de los datos limpios. El `book_id` es la
+        posición de fila en `self.data`.
+        ---------------------------------------------------------------
+        Args:
+            column (str): Columna de listas; ver `LIST_COLUMNS`.
+            rebuild (bool): Fuerza la reconstrucción de la caché.
+        ---------------------------------------------------------------
+        Returns:
+            pd.DataFrame: Columnas `book_id`, `<entidad>_id` y `<entidad>`.
+            Si no se han cargado datos o falta la columna, devuelve None.
+        """
+        if self.data is None or column not in self.data.columns:
+            print(f"Error: La columna '{column}' no se encuentra en los datos cargados.")
+            return None
+        entity = LIST_COLUMNS.get(column, column)
+        try:
+            path = self.cache_path(mode="list", column=column, rows=len(self.data))
+        except FileNotFoundError:
+            path = None
+
+        if path is not None and not rebuild and os.path.exists(path):
+            table = pd.read_parquet(path, memory_map=True)
+            # Los ids se asignaron por orden de primera aparición, el mismo
+            # orden en que aparecen los nombres en la tabla.
+            names = pd.Index(pd.unique(table[entity].to_numpy()), dtype=object)
+            table[entity] = pd.Categorical.from_codes(table[f"{entity}_id"], categories=names)
+            print(f"Tabla de {column} cargada desde la caché {path}")
+            return table
+
+        table = explode_list_column(self.data[column], entity)
+        if path is not None:
+            self._write_cache(path, [table.astype({entity: object})])
+        return table
+
+    @instrument()
     def detect_outliers(self, column: str):
         """
         Detecta valores atípicos (outliers) en una columna 
@@ -87,3 +610,114 @@ class cargar_data:
         else:
             print(f"Error: Columna '{column}' no encontrada o datos no cargados.")
             return None
+
+    @staticmethod
+    def update_sketches(sketches: dict, chunk: pd.DataFrame, error: float = DEFAULT_ERROR) -> dict:
+        """
+        Actualiza un sketch de cuantiles por columna con un bloque. Puede
+        llamarse dentro de cualquier bucle que ya esté recorriendo los
+        bloques, de modo que los sketches se llenan durante la carga.
+        ---------------------------------------------------------------
+        Args:
+            sketches (dict): Columna → KLLSketch. Las columnas sin sketch
+                             se crean con `error`.
+            chunk (pd.DataFrame): Bloque de datos.
+            error (float): Error de rango de los sketches nuevos.
+        ---------------------------------------------------------------
+        Returns:
+            dict: El mismo diccionario `sketches`, actualizado.
+        ---------------------------------------------------------------
+        Raises:
+            ValueError: Si alguna columna no está en el bloque.
+        """
+        for column in list(sketches):
+            if column not in chunk.columns:
+                raise ValueError(f"La columna '{column}' no existe en los datos.")
+            if sketches[column] is None:
+                sketches[column] = KLLSketch(error)
+            sketches[column].update(pd.to_numeric(chunk[column], errors="coerce").to_numpy())
+        return sketches
+
+    @instrument()
+    def detect_outliers_streaming(
+        self, columns, chunk_source=None, error: float = DEFAULT_ERROR, sketches: dict = None, return_rows: bool = False
+    ):
+        """
+        Versión en streaming de `detect_outliers` para varias columnas a la
+        vez. En una primera pasada mantiene un sketch de cuantiles KLL por
+        columna y deriva los límites IQR con un error de rango acotado por
+        `error`; en una segunda pasada marca las filas fuera de los límites.
+        Si ya se tienen los sketches (ver `update_sketches`), la primera
+        pasada se omite.
+        ---------------------------------------------------------------
+        Args:
+            columns (list): Columnas numéricas a analizar.
+            chunk_source (Callable, optional): Función sin argumentos que
+                devuelve un iterador nuevo de bloques. Por defecto,
+                `self.stream_cached` con sus opciones por defecto.
+            error (float): Error de rango de los sketches. Por defecto, 0.01.
+            sketches (dict, optional): Columna → KLLSketch ya calculados.
+            return_rows (bool): Si se devuelven también las filas atípicas.
+        ---------------------------------------------------------------
+        Returns:
+            dict: Columna → {"lower_bound", "upper_bound", "indices"}, donde
+            `indices` son las posiciones (0-based) de las filas atípicas en el
+            flujo de bloques. Con `return_rows`, incluye además "rows"
+            (pd.DataFrame). Si una columna no existe o no hay datos, devuelve None.
+        ---------------------------------------------------------------
+        Raises:
+            ValueError: Los errores de lectura de los bloques (p. ej. el
+                rango de `review/time`) se propagan.
+        """
+        if chunk_source is None:
+            chunk_source = self.stream_cached
+
+        def missing(chunk) -> bool:
+            # Sólo la falta de una columna se informa y devuelve None; otros
+            # errores (p. ej. un bloque mal formado) se propagan.
+            absent = [column for column in columns if column not in chunk.columns]
+            if absent:
+                print(f"Error: Columna no encontrada ({absent}).")
+            return bool(absent)
+
+        if sketches is None:
+            sketches = dict.fromkeys(columns)
+            for chunk in chunk_source():
+                if missing(chunk):
+                    return None
+                self.update_sketches(sketches, chunk, error)
+        try:
+            if any(sketches[column] is None for column in columns):
+                print("Error: Datos no cargados.")
+                return None
+            bounds = {column: sketches[column].iqr_bounds() for column in columns}
+        except KeyError as e:
+            print(f"Error: Columna no encontrada en los sketches ({e}).")
+            return None
+
+        indices = {column: [] for column in columns}
+        rows = {column: [] for column in columns}
+        offset = 0
+        for chunk in chunk_source():
+            if missing(chunk):
+                return None
+            for column, (lower_bound, upper_bound) in bounds.items():
+                values = pd.to_numeric(chunk[column], errors="coerce").to_numpy()
+                mask = (values < lower_bound) | (values > upper_bound)
+                if mask.any():
+                    positions = np.flatnonzero(mask)
+                    indices[column].append(positions + offset)
+                    if return_rows:
+                        rows[column].append(chunk.iloc[positions])
+            offset += len(chunk)
+
+        result = {}
+        for column, (lower_bound, upper_bound) in bounds.items():
+            found = np.concatenate(indices[column]) if indices[column] else np.empty(0, dtype=np.int64)
+            result[column] = {"lower_bound": lower_bound, "upper_bound": upper_bound, "indices": found}
+            if return_rows:
+                result[column]["rows"] = (
+                    pd.concat(rows[column]) if rows[column] else pd.DataFrame()
+                )
+            print(f"Se detectaron {len(found)} anomalías en la columna '{column}'.")
+        return result
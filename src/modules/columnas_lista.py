@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Columnas de `books_data.csv` que guardan listas de Python como texto
+# (p. ej. "['Jane Doe', 'John Roe']") → nombre de la entidad de cada elemento.
+LIST_COLUMNS = {"authors": "author", "categories": "category"}
+
+# Corchetes y comillas de los extremos, y separadores entre elementos. Las
+# comillas pueden ser simples o dobles: `repr` usa dobles cuando el
+# elemento contiene un apóstrofo.
+_BRACKETS = r"^\s*\[\s*['\"]?|['\"]?\s*\]\s*$"
+_SEPARATOR = r"['\"]\s*,\s*['\"]"
+
+
+def parse_list_column(values: pd.Series) -> tuple:
+    """
+    Separa una columna de listas en texto en sus elementos, con las
+    funciones de cadenas de Arrow (sin `ast.literal_eval` por fila).
+
+    Un valor sin corchetes se toma como un único elemento; los nulos, las
+    listas vacías y los elementos vacíos se omiten.
+
+    Args:
+        values (pd.Series): Listas en texto.
+
+    Returns:
+        tuple: (posición de fila de cada elemento como np.ndarray, elementos como np.ndarray).
+    """
+    array = pa.array(values.astype(object).to_numpy(), type=pa.string(), from_pandas=True)
+    stripped = pc.replace_substring_regex(array, _BRACKETS, "")
+    lists = pc.split_pattern_regex(stripped, _SEPARATOR)
+    rows = pc.list_parent_indices(lists).to_numpy()
+    items = pc.utf8_trim_whitespace(pc.replace_substring(pc.list_flatten(lists), "\\'", "'"))
+    keep = pc.not_equal(items, "").to_numpy(zero_copy_only=False)
+    return rows[keep], items.to_numpy(zero_copy_only=False)[keep]
+
+
+def explode_list_column(values: pd.Series, entity: str) -> pd.DataFrame:
+    """
+    Construye la tabla libro ↔ entidad de una columna de listas.
+
+    El `book_id` es la posición de fila del libro en `values` y el id de la
+    entidad se asigna por orden de primera aparición. Un elemento repetido
+    en la lista de un mismo libro se cuenta una sola vez.
+
+    Args:
+        values (pd.Series): Listas en texto, una por libro.
+        entity (str): Nombre de la entidad (p. ej. "author").
+
+    Returns:
+        pd.DataFrame: Columnas `book_id`, `<entity>_id` (int32) y `<entity>`
+        (categórica, con los códigos iguales a `<entity>_id`).
+    """
+    rows, items = parse_list_column(values)
+    codes, names = pd.factorize(items)
+    table = pd.DataFrame({"book_id": rows.astype(np.int32), f"{entity}_id": codes.astype(np.int32)})
+    table = table.drop_duplicates(ignore_index=True)
+    table[entity] = pd.Categorical.from_codes(table[f"{entity}_id"], categories=pd.Index(names, dtype=object))
+    return table
+
+
+def entity_counts(table: pd.DataFrame, entity: str, top_n: int = None) -> pd.Series:
+    """
+    Número de libros de cada entidad, de mayor a menor. Un libro con varios
+    autores suma uno a cada autor.
+
+    Args:
+        table (pd.DataFrame): Tabla de `explode_list_column`.
+        entity (str): Nombre de la entidad.
+        top_n (int, optional): Número de entidades a devolver. Por defecto, todas.
+
+    Returns:
+        pd.Series: Entidad → número de libros.
+    """
+    categories = table[entity].cat.categories
+    counts = np.bincount(table[f"{entity}_id"].to_numpy(), minlength=len(categories))
+    order = np.argsort(-counts, kind="stable")[:top_n]
+    return pd.Series(counts[order], index=pd.Index(categories[order].astype(str), name=entity), name="count")
+
+
+def entity_means(table: pd.DataFrame, entity: str, values, top_n: int = None) -> pd.Series:
+    """
+    Promedio por entidad de un valor por libro (p. ej. la valoración
+    promedio), sobre los libros con valor. Cada libro aporta a todas sus
+    entidades.
+
+    Args:
+        table (pd.DataFrame): Tabla de `explode_list_column`.
+        entity (str): Nombre de la entidad.
+        values (array-like): Valor de cada libro, indexado por `book_id`.
+        top_n (int, optional): Número de entidades a devolver, las de mayor promedio.
+
+    Returns:
+        pd.Series: Entidad → promedio, de mayor a menor.
+    """
+    categories = table[entity].cat.categories
+    per_book = np.asarray(values, dtype=np.float64)[table["book_id"].to_numpy()]
+    valid = ~np.isnan(per_book)
+    ids = table[f"{entity}_id"].to_numpy()[valid]
+    sums = np.bincount(ids, weights=per_book[valid], minlength=len(categories))
+    counts = np.bincount(ids, minlength=len(categories))
+    present = np.flatnonzero(counts)
+    means = pd.Series(sums[present] / counts[present], index=pd.Index(categories[present].astype(str), name=entity))
+    return means.sort_values(ascending=False, kind="stable").head(top_n if top_n is not None else len(means))
+
+
+def remap_books(table: pd.DataFrame, entity: str, book_ids) -> pd.DataFrame:
+    """
+    Cambia el `book_id` de una tabla libro ↔ entidad a otro espacio de ids
+    (p. ej. de la posición de fila en `books_data.csv` al `book_id` de
+    `TitleIndex`). Las filas sin id nuevo (-1) se descartan y, si varios
+    libros pasan a tener el mismo id, cada entidad se cuenta una sola vez.
+
+    Args:
+        table (pd.DataFrame): Tabla de `explode_list_column`.
+        entity (str): Nombre de la entidad.
+        book_ids (array-like): Id nuevo de cada `book_id` actual.
+
+    Returns:
+        pd.DataFrame: Tabla con las mismas columnas y los ids nuevos.
+    """
+    ids = np.asarray(book_ids, dtype=np.int64)[table["book_id"].to_numpy()]
+    remapped = table.assign(book_id=ids.astype(np.int32))[ids >= 0]
+    return remapped.drop_duplicates(["book_id", f"{entity}_id"], ignore_index=True)
+
+
+def entity_keys(table: pd.DataFrame, entity: str, titles: pd.Series, book_ids=None) -> pd.Series:
+    """
+    Llave título → entidad para reagrupar estadísticas por título (p. ej.
+    `BookAggregateStore.rollup` o `TimeSeriesStore.read`). Un título con
+    varias entidades aparece una vez por entidad.
+
+    Args:
+        table (pd.DataFrame): Tabla de `explode_list_column`.
+        entity (str): Nombre de la entidad.
+        titles (pd.Series): Títulos a reagrupar.
+        book_ids (array-like, optional): `book_id` de cada título en la tabla
+            (-1 si no tiene). Por defecto, la posición del título en `titles`.
+
+    Returns:
+        pd.Series: Entidad de cada título, indexada por el título.
+    """
+    if book_ids is None:
+        book_ids = np.arange(len(titles))
+    pairs = pd.DataFrame({
+        "title": titles.astype(str).to_numpy(), "book_id": np.asarray(book_ids, dtype=np.int32),
+    })
+    pairs = pairs.merge(table[["book_id", entity]], on="book_id").drop_duplicates(["title", entity])
+    index = pd.Index(pairs["title"], name="book_title")
+    return pd.Series(pairs[entity].astype(object).to_numpy(), index=index, name=entity)
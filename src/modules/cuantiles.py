@@ -0,0 +1,139 @@
+import math
+
+import numpy as np
+
+DEFAULT_ERROR = 0.01
+_CAPACITY_DECAY = 2 / 3
+
+
+class KLLSketch:
+    """
+    Sketch de cuantiles KLL (Karnin, Lang y Liberty) combinable.
+
+    Mantiene una pila de compactadores: los elementos del nivel `h` pesan
+    `2**h`. Cuando un nivel excede su capacidad se ordena y la mitad de
+    sus elementos (pares o impares, al azar) sube al nivel siguiente. La
+    memoria es O(k · log(n / k)) y el error de rango es aproximadamente
+    `error` · n.
+
+    Attributes:
+        error (float): Error de rango objetivo (fracción de n).
+        k (int): Capacidad del compactador superior.
+        n (int): Número de valores observados.
+        min (float): Mínimo exacto observado.
+        max (float): Máximo exacto observado.
+    """
+    def __init__(self, error: float = DEFAULT_ERROR, seed: int = 0):
+        """
+        Args:
+            error (float): Error de rango objetivo. Por defecto, 0.01.
+            seed (int): Semilla para la elección de mitades al compactar.
+
+        Raises:
+            ValueError: Si `error` no está en (0, 1).
+        """
+        if not 0 < error < 1:
+            raise ValueError("'error' debe estar en el intervalo (0, 1).")
+        self.error = error
+        self.k = max(8, math.ceil(1.7 / error))
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self.k * _CAPACITY_DECAY ** depth))
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                items = items[:len(items) - len(keep)]
+                promoted = items[self._rng.integers(2)::2]
+                self._levels[level] = keep
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        """
+        Agrega un bloque de valores; los NaN se ignoran.
+
+        Args:
+            values (array-like): Valores numéricos.
+        """
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Combina otro sketch (por ejemplo, de otro bloque o partición).
+
+        Args:
+            other (KLLSketch): Sketch a combinar.
+
+        Returns:
+            KLLSketch: Este sketch, actualizado.
+        """
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """
+        Estima uno o varios cuantiles.
+
+        Args:
+            q (float | array-like): Cuantil(es) en [0, 1].
+
+        Returns:
+            float | np.ndarray: Estimación de los cuantiles, o NaN si el sketch está vacío.
+        """
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else math.nan
+        items = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2.0 ** h) for h, level in enumerate(self._levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(q, dtype="float64") * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        result = np.clip(items[positions], self.min, self.max)
+        return result if np.ndim(q) else float(result)
+
+    def iqr_bounds(self, factor: float = 1.5) -> tuple:
+        """
+        Límites inferior y superior del método IQR a partir de Q1 y Q3 estimados.
+
+        Args:
+            factor (float): Multiplicador del rango intercuartil. Por defecto, 1.5.
+
+        Returns:
+            tuple: (límite inferior, límite superior).
+        """
+        q1, q3 = self.quantile([0.25, 0.75])
+        iqr = q3 - q1
+        return float(q1 - factor * iqr), float(q3 + factor * iqr)
+
+    def __len__(self):
+        return self.n
@@ -0,0 +1,242 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .perfilado import instrument
+
+_FNV_PRIME = np.uint64(0x100000001B3)
+_EMPTY_CLUSTER = -1
+
+
+def _combine(columns) -> np.ndarray:
+    # Hash de varias columnas uint64 fila por fila (desbordamiento intencional).
+    combined = np.zeros(len(columns[0]), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for column in columns:
+            combined = (combined * _FNV_PRIME) ^ column.astype(np.uint64)
+    return combined
+
+
+def shingle_hashes(texts: pd.Series, size: int = 3) -> tuple:
+    """
+    Hashes de los shingles de palabras de cada texto ya normalizado (con
+    `SentimentAnalysis.normalize_texts`). Un texto con menos de `size`
+    palabras usa sus palabras sueltas; un texto vacío no tiene shingles.
+
+    Args:
+        texts (pd.Series): Textos normalizados.
+        size (int): Palabras por shingle. Por defecto, 3.
+
+    Returns:
+        tuple: (posición del texto de cada shingle, hash de 32 bits como uint64),
+        ordenados por posición.
+    """
+    tokens = pc.split_pattern(pa.array(texts.astype(object).to_numpy(), type=pa.string(), from_pandas=True), " ")
+    docs = pc.list_parent_indices(tokens).to_numpy().astype(np.int64)
+    words = pc.list_flatten(tokens).to_numpy(zero_copy_only=False)
+    present = words != ""
+    docs, hashes = docs[present], pd.util.hash_array(words[present])
+
+    lengths = np.bincount(docs, minlength=len(texts))
+    windows = len(docs) - size + 1
+    if windows > 0:
+        full = docs[: windows] == docs[size - 1:]
+        shingles = _combine([hashes[k:k + windows] for k in range(size)])[full]
+        shingle_docs = docs[: windows][full]
+    else:
+        shingles, shingle_docs = np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    short = lengths[docs] < size
+    shingle_docs = np.concatenate([shingle_docs, docs[short]])
+    shingles = np.concatenate([shingles, hashes[short]])
+    order = np.argsort(shingle_docs, kind="stable")
+    folded = (shingles >> np.uint64(32)) ^ (shingles & np.uint64(0xFFFFFFFF))
+    return shingle_docs[order], folded[order]
+
+
+class NearDuplicateDetector:
+    """
+    Detecta reseñas casi duplicadas en streaming con MinHash y LSH.
+
+    Cada reseña se resume en una firma MinHash de `num_perm` valores sobre
+    sus shingles de palabras. La firma se divide en `bands` bandas; dos
+    reseñas son candidatas si coinciden en alguna banda completa, lo que
+    evita comparar todos los pares. Cada candidata se verifica con la
+    similitud de Jaccard estimada por las firmas y, si supera
+    `threshold`, la reseña se une al grupo (clúster) de la candidata.
+
+    Los bloques se procesan en orden: la primera reseña de cada grupo es
+    su representante, y las siguientes, incluidas las de bloques
+    posteriores, se comparan contra las representantes ya vistas. Sólo se
+    conservan las bandas y la firma de las representantes; la firma se
+    guarda con los 16 bits bajos de cada valor (b-bit MinHash), lo que
+    deja unos `bands * 8 + num_perm * 2` bytes por grupo.
+
+    Attributes:
+        num_perm (int): Valores por firma.
+        bands (int): Bandas de LSH.
+        threshold (float): Similitud mínima para unir dos reseñas.
+        shingle_size (int): Palabras por shingle.
+        reviews (int): Reseñas procesadas.
+        clusters (int): Grupos encontrados (reseñas distintas).
+    """
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.8, shingle_size: int = 3,
+                 seed: int = 0):
+        """
+        Args:
+            num_perm (int): Valores por firma. Por defecto, 64.
+            bands (int): Bandas de LSH; debe dividir a `num_perm`. Por defecto, 16
+                (bandas de 4 valores: casi todos los pares con similitud 0.8 son candidatos).
+            threshold (float): Similitud de Jaccard mínima. Por defecto, 0.8.
+            shingle_size (int): Palabras por shingle. Por defecto, 3.
+            seed (int): Semilla de las permutaciones.
+
+        Raises:
+            ValueError: Si `bands` no divide a `num_perm`.
+        """
+        if num_perm % bands:
+            raise ValueError(f"'bands' ({bands}) debe dividir a 'num_perm' ({num_perm}).")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Permutaciones por hashing multiply-shift: los 32 bits altos de
+        # `a * x + b` (mod 2**64) con `a` impar.
+        self._a = rng.integers(0, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+        self.reviews = self.clusters = 0
+        # Firmas y tamaños por grupo (arreglos que crecen al doble) y, por
+        # banda, un segmento ordenado llave → grupo por cada bloque.
+        self._signatures = np.empty((0, num_perm), dtype=np.uint16)
+        self._sizes = np.empty(0, dtype=np.int64)
+        self._values = np.empty(0, dtype=np.float64)
+        self._buckets = [[] for _ in range(bands)]
+
+    def signatures(self, texts: pd.Series) -> tuple:
+        """
+        Firmas MinHash de un bloque de textos normalizados.
+
+        Returns:
+            tuple: (firmas uint64 de forma (n, num_perm), máscara de textos con shingles).
+        """
+        docs, shingles = shingle_hashes(texts, self.shingle_size)
+        has_shingles = np.bincount(docs, minlength=len(texts)) > 0
+        signatures = np.full((len(texts), self.num_perm), 1 << 32, dtype=np.uint64)
+        if len(docs):
+            starts = np.flatnonzero(np.diff(docs, prepend=-1))
+            for j in range(self.num_perm):
+                values = (self._a[j] * shingles + self._b[j]) >> np.uint64(32)
+                signatures[docs[starts], j] = np.minimum.reduceat(values, starts)
+        return signatures, has_shingles
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        rows = self.num_perm // self.bands
+        return np.stack([
+            _combine([signatures[:, band * rows + k] for k in range(rows)]).astype(np.uint32)
+            for band in range(self.bands)
+        ], axis=1)
+
+    def _similar(self, short: np.ndarray, other: np.ndarray) -> np.ndarray:
+        return (short == other).mean(axis=1) >= self.threshold
+
+    def _grow(self, size: int):
+        if size > len(self._signatures):
+            capacity = max(size, 2 * len(self._signatures), 1024)
+            for name in ("_signatures", "_sizes", "_values"):
+                current = getattr(self, name)
+                grown = np.zeros((capacity, *current.shape[1:]), dtype=current.dtype)
+                grown[: len(current)] = current
+                setattr(self, name, grown)
+
+    @instrument()
+    def update(self, texts: pd.Series) -> tuple:
+        """
+        Asigna cada reseña de un bloque a un grupo, nuevo o ya visto.
+
+        Args:
+            texts (pd.Series): Textos normalizados del bloque.
+
+        Returns:
+            tuple: (id de grupo de cada reseña como np.ndarray, máscara de las
+            reseñas que son representantes de un grupo nuevo).
+        """
+        n = len(texts)
+        signatures, has_shingles = self.signatures(texts)
+        short = (signatures & np.uint64(0xFFFF)).astype(np.uint16)
+        keys = self._band_keys(signatures)
+
+        # Primero se buscan grupos ya vistos (representantes de bloques
+        # anteriores) y luego, para las reseñas sin grupo, la primera reseña
+        # anterior del bloque con la misma llave.
+        assigned = np.full(n, _EMPTY_CLUSTER, dtype=np.int64)
+        for band in range(self.bands):
+            for segment_keys, segment_clusters in self._buckets[band]:
+                pending = has_shingles & (assigned == _EMPTY_CLUSTER)
+                position = np.minimum(np.searchsorted(segment_keys, keys[:, band]), len(segment_keys) - 1)
+                hit = np.flatnonzero(pending & (segment_keys[position] == keys[:, band]))
+                candidates = segment_clusters[position[hit]]
+                similar = self._similar(short[hit], self._signatures[candidates])
+                assigned[hit[similar]] = candidates[similar]
+
+        order = np.arange(n)
+        parent = order.copy()
+        for band in range(self.bands):
+            pending = has_shingles & (assigned == _EMPTY_CLUSTER) & (parent == order)
+            _, first, codes = np.unique(keys[:, band], return_index=True, return_inverse=True)
+            local = first[codes]
+            rows = np.flatnonzero(pending & (local < order) & has_shingles[local])
+            rows = rows[self._similar(short[rows], short[local[rows]])]
+            parent[rows] = local[rows]
+
+        # Las cadenas dentro del bloque apuntan siempre a reseñas anteriores.
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        roots = parent == order
+        representative = roots & (assigned == _EMPTY_CLUSTER)
+        new_ids = self.clusters + np.arange(representative.sum())
+        assigned[representative] = new_ids
+        clusters = assigned[parent]
+
+        self._grow(self.clusters + len(new_ids))
+        self._signatures[new_ids] = short[representative]
+        np.add.at(self._sizes, clusters, 1)
+        indexed = representative & has_shingles
+        if indexed.any():
+            for band in range(self.bands):
+                band_keys, first = np.unique(keys[indexed, band], return_index=True)
+                self._buckets[band].append((band_keys, clusters[indexed][first]))
+        self.clusters += len(new_ids)
+        self.reviews += n
+        return clusters, representative
+
+    def propagate(self, clusters: np.ndarray, representative: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Guarda el valor (p. ej. el sentimiento) de las representantes nuevas
+        y lo propaga a todas las reseñas del bloque.
+
+        Args:
+            clusters (np.ndarray): Ids de grupo devueltos por `update`.
+            representative (np.ndarray): Máscara de representantes devuelta por `update`.
+            values (np.ndarray): Un valor por representante, en orden.
+
+        Returns:
+            np.ndarray: Valor de cada reseña del bloque.
+        """
+        self._values[clusters[representative]] = values
+        return self._values[clusters]
+
+    def summary(self) -> dict:
+        """
+        Reseñas procesadas, grupos y reseñas casi duplicadas.
+        """
+        sizes = self._sizes[: self.clusters]
+        return {
+            "reviews": self.reviews,
+            "clusters": self.clusters,
+            "duplicate_clusters": int((sizes > 1).sum()),
+            "near_duplicates": self.reviews - self.clusters,
+        }
@@ -0,0 +1,288 @@
+import os
+import time
+
+import pandas as pd
+
+from .agregados import BookAggregateStore
+from .analisis_NLP import SentimentAnalysis, SentimentScoringEngine
+from .cache_sentimientos import SentimentCache
+from .cargar_data import (
+    DEFAULT_CHUNKSIZE,
+    REVIEW_COLUMNS,
+    REVIEW_DTYPES,
+    cargar_data,
+    iter_parquet,
+    write_parquet,
+)
+from .columnas_lista import LIST_COLUMNS, entity_keys, remap_books
+from .duplicados import NearDuplicateDetector
+from .indice_invertido import InvertedIndex
+from .indice_titulos import TitleIndex
+from .instantanea import write_snapshot
+from .series_tiempo import TimeSeriesAnalysis, TimeSeriesStore
+from .top_libros import TopBooksAnalysis
+from .visualizacion import DataVisualization
+
+# Registro nombre → función de las etapas que puede declarar `config.json`.
+# Cada etapa recibe las salidas de sus dependencias (`inputs`) y sus
+# parámetros (`params`, los globales más los propios de la etapa).
+STAGES = {}
+
+
+def etapa(func):
+    """
+    Registra una función como etapa del pipeline bajo su nombre.
+    """
+    STAGES[func.__name__] = func
+    return func
+
+
+@etapa
+def load_books(inputs: dict, params: dict) -> pd.DataFrame:
+    """
+    Carga y limpia `books_data.csv` (desde la caché Parquet si existe) y,
+    salvo `compact: false`, compacta sus tipos.
+    """
+    loader = cargar_data(params["file_path_data"], cache_dir=params["cache_dir"])
+    if loader.load_cached() is not None and params.get("compact", True):
+        loader.compact()
+    return loader.data
+
+
+@etapa
+def book_lists(inputs: dict, params: dict) -> dict:
+    """
+    Tablas libro ↔ autor y libro ↔ categoría de los libros cargados,
+    guardadas junto a su caché.
+    """
+    loader = cargar_data(params["file_path_data"], cache_dir=params["cache_dir"])
+    loader.data = inputs["books"]
+    return {column: loader.load_list_table(column) for column in params.get("columns", list(LIST_COLUMNS))}
+
+
+@etapa
+def clean_reviews(inputs: dict, params: dict) -> str:
+    """
+    Limpia `books_rating.csv` en streaming y devuelve la ruta de su caché Parquet.
+    """
+    loader = cargar_data(params["file_path_rating"], cache_dir=params["cache_dir"])
+    return loader.ensure_stream_cache(
+        params.get("chunksize", DEFAULT_CHUNKSIZE), usecols=REVIEW_COLUMNS, dtype=REVIEW_DTYPES
+    )
+
+
+@etapa
+def title_index(inputs: dict, params: dict) -> TitleIndex:
+    """
+    Construye el índice de títulos normalizados → `book_id` y lo guarda.
+    """
+    index = TitleIndex.build(inputs["books"])
+    index.save(os.path.join(params["output_dir"], "title_index.parquet"))
+    return index
+
+
+@etapa
+def book_outliers(inputs: dict, params: dict) -> pd.DataFrame:
+    """
+    Detecta valores atípicos en una columna de los libros.
+    """
+    loader = cargar_data(params["file_path_data"])
+    loader.data = inputs["books"]
+    return loader.detect_outliers(params["column"])
+
+
+@etapa
+def review_outliers(inputs: dict, params: dict) -> dict:
+    """
+    Detecta valores atípicos en columnas de las reseñas con sketches de cuantiles.
+    """
+    columns = params["columns"]
+    chunksize = params.get("chunksize", DEFAULT_CHUNKSIZE)
+    loader = cargar_data(params["file_path_rating"])
+    return loader.detect_outliers_streaming(
+        columns,
+        chunk_source=lambda: iter_parquet(inputs["reviews"], chunksize, columns),
+        error=params.get("error", 0.01),
+    )
+
+
+@etapa
+def sentiment(inputs: dict, params: dict) -> str:
+    """
+    Puntúa el sentimiento de las reseñas por bloques y escribe título,
+    puntaje y sentimiento a un Parquet, cuya ruta devuelve.
+
+    Con `near_duplicates`, sólo se puntúa una reseña por grupo de casi
+    duplicadas (`NearDuplicateDetector`) y su puntaje se copia al resto;
+    con `drop_near_duplicates`, además, las copias no se escriben, así que
+    cada grupo cuenta una vez en los agregados (y las filas dejan de
+    coincidir con las de `reviews`).
+    """
+    path = os.path.join(params["output_dir"], "reviews_sentiment.parquet")
+    columns = ["Title", "review/score", "review/time", "review/text"]
+    chunksize = params.get("chunksize", DEFAULT_CHUNKSIZE)
+    cache_path = os.path.join(params["cache_dir"], "sentiments.sqlite")
+    backend = params.get("backend", "textblob")
+    detector = None
+    if params.get("near_duplicates", False):
+        detector = NearDuplicateDetector(threshold=params.get("near_duplicate_threshold", 0.8))
+    scoring = {"seconds": 0.0, "reviews": 0}
+    with (
+        SentimentScoringEngine(params.get("workers"), progress=False) as engine,
+        SentimentCache(cache_path) as cache,
+    ):
+        def score(reviews: pd.DataFrame) -> pd.DataFrame:
+            start = time.perf_counter()
+            analyzer = SentimentAnalysis(reviews, backend=backend)
+            analyzer.calculate_sentiments(engine, cache)
+            scoring["seconds"] += time.perf_counter() - start
+            scoring["reviews"] += len(reviews)
+            return reviews
+
+        def scored_chunks():
+            for chunk in iter_parquet(inputs["reviews"], chunksize, columns):
+                SentimentAnalysis(chunk, backend=backend).preprocess_reviews()
+                if detector is None:
+                    yield score(chunk).drop(columns="review/text")
+                    continue
+                clusters, representative = detector.update(chunk["review/text"])
+                scores = score(chunk[representative].copy())["sentiment_score"].to_numpy()
+                chunk["sentiment_score"] = detector.propagate(clusters, representative, scores)
+                if params.get("drop_near_duplicates", False):
+                    chunk = chunk[representative]
+                yield chunk.drop(columns="review/text")
+
+        write_parquet(path, scored_chunks())
+        print(f"Caché de sentimientos: {cache.stats()}")
+    if detector is not None:
+        summary = detector.summary()
+        per_review = scoring["seconds"] / max(scoring["reviews"], 1)
+        print(
+            f"Casi duplicados: {summary['near_duplicates']} reseñas en {summary['duplicate_clusters']} grupos "
+            f"({summary['clusters']} grupos en total); puntuación evitada estimada: "
+            f"{summary['near_duplicates'] * per_review:.1f} s"
+        )
+    return path
+
+
+@etapa
+def text_index(inputs: dict, params: dict) -> str:
+    """
+    Reconstruye el índice invertido sobre el texto de las reseñas limpias y
+    devuelve su carpeta. Los ids del índice son las posiciones de fila de
+    las reseñas, que `sentiment` conserva.
+    """
+    directory = params.get("text_index_dir") or os.path.join(params["output_dir"], "text_index")
+    index = InvertedIndex(directory, bigrams=params.get("bigrams", True))
+    index.remove()
+    index.fit_chunks(iter_parquet(inputs["reviews"], params.get("chunksize", DEFAULT_CHUNKSIZE), ["review/text"]))
+    return directory
+
+
+@etapa
+def aggregates(inputs: dict, params: dict) -> BookAggregateStore:
+    """
+    Construye el almacén de agregados por libro a partir de las reseñas puntuadas.
+    """
+    store = BookAggregateStore()
+    for chunk in iter_parquet(inputs["sentiment"], params.get("chunksize", DEFAULT_CHUNKSIZE)):
+        store.update(
+            chunk, book_column="Title", rating_column="review/score", sentiment_column="sentiment_score"
+        )
+    store.save(params["aggregates_path"])
+    return store
+
+
+@etapa
+def time_series(inputs: dict, params: dict) -> str:
+    """
+    Reconstruye los agregados diarios por libro, particionados por mes, y
+    devuelve su carpeta.
+    """
+    directory = params.get("time_series_dir") or os.path.join(params["output_dir"], "time_series")
+    chunks = iter_parquet(inputs["sentiment"], params.get("chunksize", DEFAULT_CHUNKSIZE))
+    TimeSeriesStore(directory).build(chunks)
+    return directory
+
+
+@etapa
+def trends(inputs: dict, params: dict) -> pd.DataFrame:
+    """
+    Libros en tendencia en la última ventana de `window_days` días. Con
+    `by` ("authors" o "categories"), las tendencias son por autor o
+    categoría, a partir de las tablas de `book_lists`.
+    """
+    keys = None
+    if params.get("by"):
+        entity = LIST_COLUMNS[params["by"]]
+        keys = entity_keys(inputs["book_lists"][params["by"]], entity, inputs["books"]["Title"])
+    return TimeSeriesAnalysis(TimeSeriesStore(inputs["time_series"])).trending(
+        window_days=params.get("window_days", 90),
+        top_n=params.get("top_n", 10),
+        min_reviews=params.get("min_reviews", 5),
+        keys=keys,
+    )
+
+
+@etapa
+def snapshot(inputs: dict, params: dict) -> str:
+    """
+    Escribe la instantánea de agregados por libro, autor y categoría que
+    sirve la API de consultas, y devuelve su carpeta.
+    """
+    directory = params.get("snapshot_dir") or os.path.join(params["output_dir"], "snapshot")
+    index, lists = inputs["title_index"], inputs.get("book_lists")
+    if lists is not None:
+        # Las tablas usan la posición de fila del libro; se pasan al `book_id` del índice.
+        ids = index.book_ids(inputs["books"]["Title"])
+        lists = {column: remap_books(table, LIST_COLUMNS[column], ids) for column, table in lists.items()}
+    return write_snapshot(inputs["aggregates"], index, directory, lists)
+
+
+@etapa
+def rankings(inputs: dict, params: dict) -> dict:
+    """
+    Calcula los rankings de libros desde el almacén de agregados.
+    """
+    return TopBooksAnalysis(store=inputs["aggregates"]).rank_books(
+        top_n=params.get("top_n", 10),
+        min_reviews=params.get("min_reviews", 1),
+        bayesian=params.get("bayesian", False),
+    )
+
+
+def _visualizer(params: dict, **data) -> DataVisualization:
+    return DataVisualization(
+        output_dir=params["output_dir"], image_format=params.get("image_format", "png"), **data
+    )
+
+
+@etapa
+def plot_top_authors(inputs: dict, params: dict) -> str:
+    """
+    Gráfico de los autores con más libros, guardado como archivo.
+    """
+    visualizer = _visualizer(params, book_details=inputs["books"], lists=inputs.get("book_lists"))
+    return visualizer.plot_top_authors_by_books(params.get("top_n", 10))
+
+
+@etapa
+def plot_top_books(inputs: dict, params: dict) -> str:
+    """
+    Gráfico de los libros con más reseñas, a partir del almacén de agregados.
+    """
+    top_n = params.get("top_n", 10)
+    counts = inputs["aggregates"].top_n("review_count", top_n).set_index("book_title")["review_count"]
+    return _visualizer(params).plot_top_books_by_reviews(top_n, review_counts=counts)
+
+
+@etapa
+def plot_sentiment_distribution(inputs: dict, params: dict) -> str:
+    """
+    Histograma de la distribución de sentimientos, acumulado por bloques.
+    """
+    counts, edges = None, None
+    for chunk in iter_parquet(inputs["sentiment"], params.get("chunksize", DEFAULT_CHUNKSIZE), ["sentiment_score"]):
+        chunk_counts, edges = DataVisualization.sentiment_histogram(chunk["sentiment_score"])
+        counts = chunk_counts if counts is None else counts + chunk_counts
+    return _visualizer(params).plot_sentiment_distribution(histogram=(counts, edges))
@@ -0,0 +1,306 @@
+import glob
+import json
+import os
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+from .analisis_NLP import SentimentAnalysis
+from .perfilado import instrument
+
+META_FILE = "meta.json"
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _varint_sizes(values: np.ndarray) -> np.ndarray:
+    sizes = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 5):
+        sizes += values >= np.uint64(1 << (7 * k))
+    return sizes
+
+
+def encode_varint(values: np.ndarray) -> np.ndarray:
+    """
+    Codifica enteros no negativos como varint (7 bits por byte; el bit
+    alto indica que el valor continúa en el byte siguiente).
+
+    Args:
+        values (np.ndarray): Enteros no negativos menores que 2**35.
+
+    Returns:
+        np.ndarray: Bytes como uint8.
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = _varint_sizes(values)
+    starts = np.cumsum(sizes) - sizes
+    output = np.empty(int(sizes.sum()), dtype=np.uint8)
+    for k in range(5):
+        selected = sizes > k
+        byte = (values[selected] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (sizes[selected] > k + 1).astype(np.uint64) << np.uint64(7)
+        output[starts[selected] + k] = byte | more
+    return output
+
+
+def decode_varint(data: np.ndarray) -> np.ndarray:
+    """
+    Decodifica una secuencia de varints de `encode_varint`.
+
+    Returns:
+        np.ndarray: Valores como int64.
+    """
+    data = np.asarray(data, dtype=np.uint8)
+    if not len(data):
+        return _EMPTY
+    ends = np.flatnonzero(data < 0x80)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    shifts = (np.arange(len(data)) - np.repeat(starts, ends - starts + 1)) * 7
+    parts = (data & 0x7F).astype(np.int64) << shifts
+    return np.add.reduceat(parts, starts)
+
+
+def _term_hashes(terms) -> np.ndarray:
+    # Los términos se guardan como hash de 64 bits: el vocabulario no se
+    # carga en memoria y la búsqueda es binaria sobre un arreglo mapeado.
+    return pd.util.hash_array(np.asarray(terms, dtype=object))
+
+
+class InvertedIndex:
+    """
+    Índice invertido término → reseñas sobre el texto normalizado con
+    `SentimentAnalysis.normalize_texts` (el mismo resultado que `clean_text`).
+
+    Se indexan palabras y, opcionalmente, bigramas, que resuelven las
+    búsquedas de frases. Cada término tiene una lista de ids de reseña
+    ordenada, codificada como diferencias en varint. El índice se guarda
+    en segmentos: cada llamada a `add` escribe uno nuevo (hashes de los
+    términos, offsets y listas comprimidas como `.npy`) que se lee con
+    memory-map, así que construirlo por bloques o agregar reseñas nuevas
+    no reescribe lo ya indexado.
+
+    Los ids de reseña son posiciones consecutivas en el orden en que se
+    agregaron, es decir, posiciones de fila en el conjunto indexado.
+
+    Attributes:
+        directory (str): Carpeta del índice.
+        bigrams (bool): Si se indexan bigramas para búsquedas de frases.
+        segments (list): Metadatos de cada segmento.
+        num_docs (int): Número de reseñas indexadas.
+    """
+    def __init__(self, directory: str, bigrams: bool = True):
+        """
+        Abre el índice de `directory` o prepara uno vacío.
+
+        Args:
+            directory (str): Carpeta del índice.
+            bigrams (bool): Si se indexan bigramas. Un índice existente
+                conserva la opción con que se creó.
+        """
+        self.directory = directory
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            self.bigrams, self.segments, self.num_docs = meta["bigrams"], meta["segments"], meta["num_docs"]
+        else:
+            self.bigrams, self.segments, self.num_docs = bigrams, [], 0
+        self._arrays = {}
+
+    def _save_meta(self):
+        tmp_path = os.path.join(self.directory, f"{META_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"bigrams": self.bigrams, "segments": self.segments, "num_docs": self.num_docs}, f)
+        os.replace(tmp_path, os.path.join(self.directory, META_FILE))
+
+    def _vectorizer(self) -> CountVectorizer:
+        return CountVectorizer(
+            tokenizer=str.split,
+            token_pattern=None,
+            lowercase=False,
+            binary=True,
+            ngram_range=(1, 2 if self.bigrams else 1),
+            dtype=np.uint8,
+        )
+
+    @instrument()
+    def add(self, texts: pd.Series) -> np.ndarray:
+        """
+        Indexa un bloque de reseñas como un segmento nuevo.
+
+        Args:
+            texts (pd.Series): Textos originales; se normalizan aquí.
+
+        Returns:
+            np.ndarray: Ids asignados a las reseñas del bloque.
+        """
+        first = self.num_docs
+        ids = np.arange(first, first + len(texts), dtype=np.int64)
+        if not len(texts):
+            return ids
+        normalized = SentimentAnalysis.normalize_texts(texts)
+        vectorizer = self._vectorizer()
+        try:
+            matrix = vectorizer.fit_transform(normalized)
+        except ValueError:
+            # Bloque sin ningún término (todas las reseñas vacías).
+            matrix = None
+        name = f"segment-{len(self.segments):05d}"
+        if matrix is not None:
+            self._write_segment(name, matrix.tocsc(), vectorizer.get_feature_names_out(), first)
+        self.segments.append({"name": name, "first": first, "docs": len(texts), "empty": matrix is None})
+        self.num_docs += len(texts)
+        self._save_meta()
+        return ids
+
+    def _write_segment(self, name: str, matrix, vocabulary: list, first: int):
+        # Columnas de la matriz CSC = términos; sus índices, las reseñas en orden.
+        docs = matrix.indices.astype(np.int64) + first
+        starts = matrix.indptr[:-1]
+        deltas = docs.copy()
+        deltas[1:] -= docs[:-1]
+        deltas[starts] = docs[starts]
+        encoded = encode_varint(deltas)
+        sizes = _varint_sizes(deltas.astype(np.uint64))
+        byte_offsets = np.concatenate([[0], np.cumsum(sizes)])[matrix.indptr]
+
+        hashes = _term_hashes(vocabulary)
+        order = np.argsort(hashes, kind="stable")
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(self.directory, name)
+        np.save(f"{prefix}.hashes.npy", hashes[order])
+        np.save(f"{prefix}.offsets.npy", np.stack([byte_offsets[:-1][order], byte_offsets[1:][order]], axis=1))
+        np.save(f"{prefix}.postings.npy", encoded)
+
+    def fit_chunks(self, chunks, text_column: str = "review/text") -> int:
+        """
+        Indexa un iterable de bloques de reseñas (un segmento por bloque).
+
+        Returns:
+            int: Número total de reseñas indexadas.
+        """
+        for chunk in chunks:
+            self.add(chunk[text_column])
+        print(f"Índice invertido: {self.num_docs} reseñas en {len(self.segments)} segmentos.")
+        return self.num_docs
+
+    def _segment_arrays(self, name: str):
+        if name not in self._arrays:
+            prefix = os.path.join(self.directory, name)
+            self._arrays[name] = tuple(
+                np.load(f"{prefix}.{part}.npy", mmap_mode="r") for part in ("hashes", "offsets", "postings")
+            )
+        return self._arrays[name]
+
+    def _postings(self, term: str) -> np.ndarray:
+        key = _term_hashes([term])[0]
+        results = []
+        for segment in self.segments:
+            if segment["empty"]:
+                continue
+            hashes, offsets, postings = self._segment_arrays(segment["name"])
+            position = np.searchsorted(hashes, key)
+            if position < len(hashes) and hashes[position] == key:
+                start, end = offsets[position]
+                results.append(np.cumsum(decode_varint(postings[start:end])))
+        return np.concatenate(results) if results else _EMPTY
+
+    @staticmethod
+    def _tokens(text: str) -> list:
+        return SentimentAnalysis.normalize_texts(pd.Series([text])).iloc[0].split()
+
+    def term(self, word: str) -> np.ndarray:
+        """
+        Reseñas que contienen una palabra.
+
+        Returns:
+            np.ndarray: Ids de reseña ordenados.
+        """
+        tokens = self._tokens(word)
+        return self._postings(tokens[0]) if len(tokens) == 1 else self.phrase(word)
+
+    def all_of(self, words) -> np.ndarray:
+        """
+        Reseñas que contienen todas las palabras (AND). Se intersecta
+        empezando por la lista más corta.
+        """
+        postings = sorted((self.term(word) for word in words), key=len)
+        if not postings:
+            return _EMPTY
+        return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), postings)
+
+    def any_of(self, words) -> np.ndarray:
+        """
+        Reseñas que contienen alguna de las palabras (OR).
+        """
+        postings = [self.term(word) for word in words]
+        return np.unique(np.concatenate(postings)) if postings else _EMPTY
+
+    def phrase(self, text: str, texts=None) -> np.ndarray:
+        """
+        Reseñas que contienen la frase. Con bigramas, una frase de dos
+        palabras es exacta. Una más larga exige primero todos sus bigramas,
+        lo que también acepta reseñas con los bigramas en otro orden (p. ej.
+        "very good ... not very" para "not very good"); con `texts`, esas
+        candidatas se verifican sobre su texto normalizado y el resultado es
+        exacto. Sin `texts`, el resultado es aproximado: un superconjunto
+        de las reseñas que contienen la frase.
+
+        Args:
+            text (str): Frase a buscar.
+            texts (pd.Series | callable, optional): Texto original de las
+                reseñas, por posición (id), o una función que recibe los ids
+                de las candidatas y devuelve sus textos.
+
+        Returns:
+            np.ndarray: Ids de reseña ordenados.
+
+        Raises:
+            ValueError: Si la frase tiene varias palabras y el índice no tiene bigramas.
+        """
+        tokens = self._tokens(text)
+        if len(tokens) <= 1:
+            return self._postings(tokens[0]) if tokens else _EMPTY
+        if not self.bigrams:
+            raise ValueError("El índice se construyó sin bigramas; no admite búsquedas de frases.")
+        bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        postings = sorted((self._postings(bigram) for bigram in bigrams), key=len)
+        candidates = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), postings)
+        if len(tokens) == 2 or texts is None or not len(candidates):
+            return candidates
+        found = texts(candidates) if callable(texts) else texts.iloc[candidates]
+        normalized = " " + SentimentAnalysis.normalize_texts(pd.Series(np.asarray(found, dtype=object))) + " "
+        return candidates[normalized.str.contains(f" {' '.join(tokens)} ", regex=False).to_numpy()]
+
+    def search(self, all_of=(), any_of=(), phrases=(), texts=None) -> np.ndarray:
+        """
+        Combina los criterios con AND: todas las palabras de `all_of`,
+        alguna de `any_of` y cada frase de `phrases`.
+
+        Args:
+            texts (pd.Series | callable, optional): Textos para verificar las
+                frases largas, como en `phrase`.
+
+        Returns:
+            np.ndarray: Ids de reseña ordenados.
+
+        Raises:
+            ValueError: Si no se da ningún criterio.
+        """
+        parts = [self.all_of(all_of)] if all_of else []
+        parts += [self.any_of(any_of)] if any_of else []
+        parts += [self.phrase(phrase, texts) for phrase in phrases]
+        if not parts:
+            raise ValueError("Debe indicar al menos un criterio de búsqueda.")
+        return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), sorted(parts, key=len))
+
+    def remove(self):
+        """
+        Elimina los archivos del índice.
+        """
+        for path in glob.glob(os.path.join(self.directory, "segment-*.npy")):
+            os.remove(path)
+        if os.path.exists(os.path.join(self.directory, META_FILE)):
+            os.remove(os.path.join(self.directory, META_FILE))
+        self.segments, self.num_docs, self._arrays = [], 0, {}
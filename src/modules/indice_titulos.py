@@ -0,0 +1,172 @@
+import os
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from .analisis_NLP import SentimentAnalysis
+
+BOOK_ATTRIBUTES = ("authors", "categories", "publisher", "ratingsCount")
+
+
+class TitleIndex:
+    """
+    Índice que une `books_data.csv` con `books_rating.csv` por el título.
+
+    Los títulos se normalizan una sola vez (NFKC, minúsculas, sin
+    puntuación ni espacios repetidos) y a cada título normalizado se le
+    asigna un `book_id` entero compacto. Los atributos de los libros se
+    guardan como columnas indexadas por `book_id`, de modo que unir una
+    reseña con su libro es una búsqueda por posición y no un merge de
+    cadenas.
+
+    Attributes:
+        keys (pd.Index): Títulos normalizados; la posición es el `book_id`.
+        books (pd.DataFrame): Título original y atributos, con índice `book_id`.
+    """
+    def __init__(self, keys: pd.Index = None, books: pd.DataFrame = None):
+        """
+        Args:
+            keys (pd.Index, optional): Títulos normalizados, en orden de `book_id`.
+            books (pd.DataFrame, optional): Atributos por `book_id`.
+        """
+        self.keys = keys if keys is not None else pd.Index([], dtype=object)
+        self.books = books if books is not None else pd.DataFrame(columns=["Title", *BOOK_ATTRIBUTES])
+
+    @staticmethod
+    def normalize_titles(titles: pd.Series) -> pd.Series:
+        """
+        Normaliza títulos para compararlos: NFKC y la misma limpieza que
+        `SentimentAnalysis.normalize_texts`. Sólo se procesa cada título
+        distinto una vez.
+
+        Args:
+            titles (pd.Series): Títulos originales.
+
+        Returns:
+            pd.Series: Títulos normalizados, con el mismo índice.
+        """
+        codes, uniques = pd.factorize(titles.astype(str))
+        uniques = pd.Series([unicodedata.normalize("NFKC", title) for title in uniques])
+        normalized = SentimentAnalysis.normalize_texts(uniques).to_numpy()
+        return pd.Series(normalized[codes], index=titles.index, dtype=object)
+
+    @classmethod
+    def build(cls, books_data: pd.DataFrame, title_column: str = "Title"):
+        """
+        Construye el índice a partir de los datos de libros. Si varios libros
+        comparten el título normalizado, se conservan los atributos del primero.
+
+        Args:
+            books_data (pd.DataFrame): Datos de `books_data.csv`.
+            title_column (str): Columna con el título. Por defecto, "Title".
+
+        Returns:
+            TitleIndex: Índice construido.
+        """
+        return cls().update(books_data, title_column)
+
+    def update(self, books_data: pd.DataFrame, title_column: str = "Title"):
+        """
+        Agrega libros nuevos al índice sin cambiar los `book_id` existentes.
+
+        Args:
+            books_data (pd.DataFrame): Libros a agregar.
+            title_column (str): Columna con el título. Por defecto, "Title".
+
+        Returns:
+            TitleIndex: Este índice, actualizado.
+        """
+        keys = self.normalize_titles(books_data[title_column])
+        new = (self.keys.get_indexer(keys) == -1) & ~keys.duplicated().to_numpy()
+        if not new.any():
+            return self
+        added = books_data.loc[new].reindex(columns=[title_column, *BOOK_ATTRIBUTES])
+        added = added.rename(columns={title_column: "Title"})
+        added.index = pd.RangeIndex(len(self.keys), len(self.keys) + len(added), name="book_id")
+        self.keys = self.keys.append(pd.Index(keys[new].to_numpy(), dtype=object))
+        self.books = pd.concat([self.books, added]) if len(self.books) else added
+        print(f"Índice de títulos: {int(new.sum())} libros nuevos, {len(self.keys)} en total.")
+        return self
+
+    def book_ids(self, titles: pd.Series) -> np.ndarray:
+        """
+        Devuelve el `book_id` de cada título (-1 si el libro no está indexado).
+
+        Args:
+            titles (pd.Series): Títulos de las reseñas.
+
+        Returns:
+            np.ndarray: `book_id` como int32.
+        """
+        # Los títulos nulos quedan con código -1, que apunta al -1 agregado al final.
+        codes, uniques = pd.factorize(titles)
+        ids = self.keys.get_indexer(self.normalize_titles(pd.Series(uniques)))
+        ids = np.append(ids, -1).astype(np.int32)
+        return ids[codes]
+
+    def attach(self, reviews: pd.DataFrame, title_column: str = "Title", columns=BOOK_ATTRIBUTES) -> pd.DataFrame:
+        """
+        Agrega a cada reseña su `book_id`, el título canónico (`book_title`)
+        y los atributos pedidos del libro mediante búsquedas por entero.
+
+        Args:
+            reviews (pd.DataFrame): Reseñas.
+            title_column (str): Columna con el título. Por defecto, "Title".
+            columns (Iterable[str]): Atributos a agregar. Por defecto, autores,
+                categorías, editorial y `ratingsCount`.
+
+        Returns:
+            pd.DataFrame: Copia de las reseñas con las columnas agregadas.
+            Las reseñas sin libro indexado quedan con `book_id` -1, atributos nulos
+            y su propio título como `book_title`.
+        """
+        ids = self.book_ids(reviews[title_column])
+        found = ids >= 0
+        positions = np.where(found, ids, 0)
+        result = reviews.copy()
+        result["book_id"] = ids
+        for column in ("Title", *columns):
+            values = self.books[column].to_numpy()
+            attached = pd.Series(
+                values[positions] if len(values) else None, index=reviews.index, dtype=object
+            ).where(found)
+            if column == "Title":
+                # Sin libro indexado se conserva el título de la reseña.
+                result["book_title"] = attached.fillna(reviews[title_column].astype(object))
+            else:
+                result[column] = attached
+        print(f"Reseñas unidas a su libro: {int(found.sum())} de {len(reviews)}.")
+        return result
+
+    def save(self, path: str):
+        """
+        Guarda el índice en un archivo Parquet.
+
+        Args:
+            path (str): Ruta de destino.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table = self.books.assign(key=self.keys.to_numpy())
+        table.to_parquet(path)
+        print(f"Índice de títulos guardado en {path}")
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Carga un índice guardado con `save`.
+
+        Args:
+            path (str): Ruta del archivo Parquet.
+
+        Returns:
+            TitleIndex: Índice cargado.
+        """
+        table = pd.read_parquet(path)
+        keys = pd.Index(table.pop("key").to_numpy(), dtype=object)
+        return cls(keys, table)
+
+    def __len__(self):
+        return len(self.keys)
@@ -0,0 +1,182 @@
+import glob
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from .agregados import BookAggregateStore
+from .columnas_lista import entity_keys, explode_list_column
+from .indice_titulos import TitleIndex
+
+MANIFEST = "manifest.json"
+ENTITIES = {"books": "book_title", "authors": "author", "categories": "category"}
+METRIC_COLUMNS = ("review_count", "average_rating", "rating_std", "average_sentiment", "sentiment_std")
+
+
+def write_snapshot(store: BookAggregateStore, index: TitleIndex, directory: str, lists: dict = None) -> str:
+    """
+    Escribe una instantánea de los agregados por libro, autor y categoría.
+
+    Cada instantánea se escribe en su propia subcarpeta y sólo al final se
+    reemplaza `manifest.json` (de forma atómica) para apuntar a ella, así
+    que un lector nunca ve una instantánea a medio escribir. Se conserva la
+    instantánea anterior para los lectores que aún la estén cargando.
+
+    Args:
+        store (BookAggregateStore): Agregados por título de reseña.
+        index (TitleIndex): Índice de títulos con los atributos de los libros.
+        directory (str): Carpeta de las instantáneas.
+        lists (dict, optional): "authors"/"categories" → tabla de
+            `explode_list_column` con el `book_id` de `index` (ver
+            `remap_books`). Por defecto, se explotan las columnas de `index.books`.
+
+    Returns:
+        str: Carpeta de la instantánea escrita.
+    """
+    titles = pd.Series(store.stats.index, index=store.stats.index)
+    keys = TitleIndex.normalize_titles(titles)
+    books = store.rollup(keys, "key").summary()
+
+    # Atributos del libro indexado; si el título no está en el índice, se
+    # usa el primer título de reseña con esa llave.
+    ids = index.keys.get_indexer(books["key"])
+    found = ids >= 0
+    positions = np.where(found, ids, 0)
+    first_titles = titles.groupby(keys.to_numpy(), sort=False).first()
+    books.insert(1, "book_title", first_titles.reindex(books["key"]).to_numpy())
+    for column in ("Title", "authors", "categories", "publisher"):
+        values = index.books[column].to_numpy() if len(index) else np.array([None])
+        attached = pd.Series(values[positions], dtype=object).where(found)
+        if column == "Title":
+            books["book_title"] = attached.fillna(books["book_title"])
+        else:
+            books[column] = attached
+
+    # Cada libro suma sus estadísticas a cada uno de sus autores y categorías.
+    book_ids = index.book_ids(titles)
+    tables = {"books": books.sort_values("key", ignore_index=True)}
+    for column in ("authors", "categories"):
+        entity = ENTITIES[column]
+        table = lists[column] if lists is not None else explode_list_column(index.books[column], entity)
+        keys = entity_keys(table, entity, titles, book_ids)
+        tables[column] = store.rollup(keys, entity).summary()
+
+    version = f"{time.time_ns():x}"
+    target = os.path.join(directory, version)
+    os.makedirs(target, exist_ok=True)
+    for entity, table in tables.items():
+        table.to_parquet(os.path.join(target, f"{entity}.parquet"), index=False)
+
+    manifest = {"version": version, "created": time.time(), "rows": {e: len(t) for e, t in tables.items()}}
+    tmp_path = os.path.join(directory, f"{MANIFEST}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    previous = _read_manifest(directory)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST))
+
+    keep = {version, previous["version"] if previous else None}
+    for path in glob.glob(os.path.join(directory, "*", "")):
+        if os.path.basename(os.path.dirname(path)) not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+    print(f"Instantánea de agregados {version} escrita en {target}")
+    return target
+
+
+def _read_manifest(directory: str):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class StatsSnapshot:
+    """
+    Instantánea de agregados cargada en memoria para responder consultas:
+    top-N por métrica, búsqueda de un libro y búsqueda por prefijo de título.
+
+    La tabla de libros está ordenada por título normalizado, por lo que la
+    búsqueda de un libro y la de un prefijo son búsquedas binarias.
+
+    Attributes:
+        version (str): Versión de la instantánea.
+        tables (dict): Entidad ("books", "authors", "categories") → DataFrame.
+    """
+    def __init__(self, version: str, tables: dict):
+        """
+        Args:
+            version (str): Versión de la instantánea.
+            tables (dict): Entidad → DataFrame de `summary`.
+        """
+        self.version = version
+        self.tables = tables
+        self._keys = tables["books"]["key"].to_numpy(dtype=object)
+
+    @classmethod
+    def load(cls, directory: str):
+        """
+        Carga la instantánea vigente según `manifest.json`.
+
+        Args:
+            directory (str): Carpeta de las instantáneas.
+
+        Returns:
+            StatsSnapshot: Instantánea cargada.
+
+        Raises:
+            FileNotFoundError: Si no existe ninguna instantánea.
+        """
+        manifest = _read_manifest(directory)
+        if manifest is None:
+            raise FileNotFoundError(f"No existe una instantánea de agregados en {directory}")
+        target = os.path.join(directory, manifest["version"])
+        tables = {entity: pd.read_parquet(os.path.join(target, f"{entity}.parquet")) for entity in ENTITIES}
+        print(f"Instantánea de agregados {manifest['version']} cargada: {manifest['rows']}")
+        return cls(manifest["version"], tables)
+
+    def top(self, entity: str = "books", metric: str = "review_count", top_n: int = 10, min_reviews: int = 1) -> pd.DataFrame:
+        """
+        Devuelve las `top_n` filas de una entidad con mayor valor de `metric`.
+
+        Raises:
+            ValueError: Si la entidad o la métrica no existen.
+        """
+        if entity not in self.tables:
+            raise ValueError(f"Entidad desconocida '{entity}'; use una de {tuple(ENTITIES)}.")
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Métrica desconocida '{metric}'; use una de {METRIC_COLUMNS}.")
+        table = self.tables[entity]
+        if min_reviews > 1:
+            table = table[table["review_count"] >= min_reviews]
+        return table.nlargest(top_n, metric)
+
+    def book(self, title: str) -> pd.DataFrame:
+        """
+        Busca un libro por su título (se normaliza antes de buscar).
+
+        Returns:
+            pd.DataFrame: La fila del libro, o un DataFrame vacío.
+        """
+        key = TitleIndex.normalize_titles(pd.Series([title])).iloc[0]
+        position = np.searchsorted(self._keys, key)
+        found = position < len(self._keys) and self._keys[position] == key
+        return self.tables["books"].iloc[position:position + int(found)]
+
+    def search(self, prefix: str, limit: int = 20) -> pd.DataFrame:
+        """
+        Libros cuyo título normalizado empieza con `prefix`; si hay más de
+        `limit`, se devuelven los más reseñados.
+
+        Returns:
+            pd.DataFrame: Libros encontrados.
+        """
+        key = TitleIndex.normalize_titles(pd.Series([prefix])).iloc[0]
+        start = np.searchsorted(self._keys, key, side="left")
+        end = np.searchsorted(self._keys, key + "\uffff", side="left")
+        matches = self.tables["books"].iloc[start:end]
+        if len(matches) > limit:
+            matches = matches.nlargest(limit, "review_count")
+        return matches
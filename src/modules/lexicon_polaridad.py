@@ -0,0 +1,113 @@
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from textblob.en import sentiment as pattern_sentiment
+
+# Contracciones negativas sin apóstrofe, como quedan después de
+# `SentimentAnalysis.clean_text`. `TOKEN_PATTERN` no separa el sufijo
+# "n't" (la negación de Pattern), así que cada contracción se lista
+# completa: sin apóstrofe para el texto limpio y con apóstrofe para el
+# texto original ("don't").
+CONTRACTIONS = (
+    "dont", "doesnt", "didnt", "isnt", "wasnt", "arent", "werent", "hasnt", "havent", "hadnt",
+    "cant", "couldnt", "wont", "wouldnt", "shouldnt",
+)
+NEGATIONS = ("no", "not", "never", *CONTRACTIONS, *(f"{word[:-1]}'t" for word in CONTRACTIONS))
+NEGATION_FACTOR = -0.5
+TOKEN_PATTERN = r"(?u)\b\w[\w']*\b"
+
+
+class LexiconPolarityScorer:
+    """
+    Puntuador de polaridad vectorizado basado en el léxico de Pattern que
+    usa TextBlob. El léxico se compila una sola vez en una tabla
+    token → puntaje y una columna completa se puntúa como
+    `conteos dispersos @ vector del léxico`.
+
+    Las negaciones ("not good") y los intensificadores ("very good") se
+    modelan como bigramas cuyo peso corrige la suma de la palabra
+    original, de modo que el resultado aproxima el promedio de
+    evaluaciones de TextBlob sin recorrer los textos en Python.
+
+    Attributes:
+        vectorizer (CountVectorizer): Tokenizador con vocabulario fijo.
+        score_weights (np.ndarray): Aporte de cada término a la suma de polaridades.
+        count_weights (np.ndarray): Aporte de cada término al número de evaluaciones.
+    """
+    def __init__(self):
+        """
+        Compila el léxico de Pattern en los vectores de pesos.
+        """
+        pattern_sentiment.load()
+        polarity, intensifiers = {}, {}
+        for word, senses in pattern_sentiment.items():
+            if " " in word or not senses:
+                continue
+            scores = senses.get(None) or np.mean(list(senses.values()), axis=0)
+            polarity[word] = float(scores[0])
+            if ("RB" in senses or word.endswith("ly")) and float(scores[2]) != 1.0:
+                intensifiers[word] = float(scores[2])
+
+        terms, score_weights, count_weights = [], [], []
+        for word, p in polarity.items():
+            terms.append(word)
+            score_weights.append(p)
+            count_weights.append(1.0)
+        for word, p in polarity.items():
+            if p == 0:
+                continue
+            for negation in NEGATIONS:
+                # "not good": la palabra pasa a valer p * -0.5.
+                terms.append(f"{negation} {word}")
+                score_weights.append(p * NEGATION_FACTOR - p)
+                count_weights.append(0.0)
+            for modifier, intensity in intensifiers.items():
+                # "very good": una sola evaluación con p * intensidad en lugar
+                # de dos evaluaciones (modificador y palabra).
+                terms.append(f"{modifier} {word}")
+                score_weights.append(
+                    max(-1.0, min(p * intensity, 1.0)) - p - polarity[modifier]
+                )
+                count_weights.append(-1.0)
+
+        self.vectorizer = CountVectorizer(
+            vocabulary={term: i for i, term in enumerate(terms)},
+            ngram_range=(1, 2),
+            token_pattern=TOKEN_PATTERN,
+            lowercase=True,
+            dtype=np.float64,
+        )
+        self.score_weights = np.asarray(score_weights)
+        self.count_weights = np.asarray(count_weights)
+
+    def counts(self, texts) -> sparse.csr_matrix:
+        """
+        Tokeniza los textos y devuelve la matriz dispersa de conteos
+        (reseñas × términos del léxico).
+
+        Args:
+            texts (Iterable[str]): Textos a tokenizar.
+
+        Returns:
+            sparse.csr_matrix: Matriz de conteos.
+        """
+        return self.vectorizer.transform(texts)
+
+    def score(self, texts) -> np.ndarray:
+        """
+        Calcula la polaridad de cada texto en una sola pasada matricial.
+        Los textos sin palabras del léxico reciben 0, igual que en TextBlob.
+
+        Args:
+            texts (Iterable[str]): Textos a puntuar.
+
+        Returns:
+            np.ndarray: Puntajes en [-1, 1], en el mismo orden que `texts`.
+        """
+        counts = self.counts(texts)
+        totals = counts @ self.score_weights
+        assessments = counts @ self.count_weights
+        scores = np.divide(
+            totals, assessments, out=np.zeros_like(totals), where=assessments > 0
+        )
+        return np.clip(scores, -1.0, 1.0)
@@ -0,0 +1,287 @@
+"""
+Ejecución map-reduce del análisis de reseñas particionado por libro.
+
+Ejecución desde la raíz del repositorio:
+
+    python -m src.modules.particiones --workers 4 --output ./src/data/output/particiones
+"""
+import argparse
+import glob
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .agregados import BookAggregateStore
+from .analisis_NLP import SentimentAnalysis
+from .cargar_data import (
+    DEFAULT_CHUNKSIZE,
+    REVIEW_COLUMNS,
+    REVIEW_DTYPES,
+    cargar_data,
+    iter_parquet,
+    review_time_int32,
+    write_parquet,
+)
+from .perfilado import instrument
+from .top_libros import TopBooksAnalysis
+
+# Posición de cada reseña en el CSV; permite reconstruir el orden original
+# al combinar las particiones.
+ROW_COLUMN = "_row"
+SENTIMENT_OUTPUT_COLUMNS = ["Title", "review/score", "review/time", "sentiment_score"]
+
+
+def partition_ids(titles: pd.Series, partitions: int) -> np.ndarray:
+    """
+    Partición de cada reseña según el hash de su título. Todas las reseñas
+    de un libro (y por lo tanto todos sus duplicados) caen en la misma
+    partición. Los títulos nulos van a la partición 0.
+
+    Args:
+        titles (pd.Series): Títulos de las reseñas.
+        partitions (int): Número de particiones.
+
+    Returns:
+        np.ndarray: Número de partición de cada reseña.
+    """
+    codes, uniques = pd.factorize(titles)
+    hashes = pd.util.hash_array(np.asarray(uniques, dtype=object)) % np.uint64(partitions)
+    return np.append(hashes, 0).astype(np.int32)[codes]
+
+
+def _process_partition(directory: str, output_path: str, backend: str, chunksize: int):
+    """
+    Limpia, puntúa y agrega una partición. Vive a nivel de módulo para
+    poder ejecutarse en un proceso trabajador.
+
+    Returns:
+        tuple: (estadísticas por libro, primera fila de cada libro) o None si
+        la partición quedó vacía.
+    """
+    # Los archivos de la partición se numeran por bloque del CSV y cada uno
+    # está en orden de fila, así que la salida queda ordenada por `_row`,
+    # como la necesita la mezcla de `_merge_by_row`.
+    files = sorted(glob.glob(os.path.join(directory, "*.parquet")))
+    chunks = (chunk for path in files for chunk in iter_parquet(path, chunksize))
+    # Los duplicados se buscan sin la columna de posición; se conserva la
+    # primera aparición, igual que en la limpieza en un solo proceso.
+    store, first_rows = BookAggregateStore(), []
+
+    def scored_chunks():
+        for chunk in cargar_data.clean_chunks(chunks, subset=REVIEW_COLUMNS):
+            chunk = review_time_int32(chunk, directory)
+            analyzer = SentimentAnalysis(chunk, backend=backend)
+            analyzer.preprocess_reviews()
+            analyzer.calculate_sentiments()
+            store.update(
+                chunk, book_column="Title", rating_column="review/score", sentiment_column="sentiment_score"
+            )
+            first_rows.append(chunk.groupby(chunk["Title"].astype(str), sort=False)[ROW_COLUMN].min())
+            yield chunk[[*SENTIMENT_OUTPUT_COLUMNS, ROW_COLUMN]]
+
+    if not write_parquet(output_path, scored_chunks()):
+        return None
+    first_rows = pd.concat(first_rows).groupby(level=0).min()
+    return store.stats, first_rows
+
+
+def _merge_by_row(iterators):
+    """
+    Mezcla k-way en streaming de iteradores de bloques ordenados por `_row`.
+
+    En cada paso se emiten, de todos los búferes, las filas hasta la menor
+    de sus últimas posiciones: ninguna fila pendiente puede ser anterior.
+    Se mantiene a lo sumo un bloque por iterador en memoria.
+
+    Args:
+        iterators (list): Iteradores de DataFrames ordenados por `_row`.
+
+    Yields:
+        pd.DataFrame: Bloques ordenados por `_row`.
+    """
+    def pull(iterator):
+        return next((chunk for chunk in iterator if len(chunk)), None)
+
+    buffers = {}
+    for i, iterator in enumerate(iterators):
+        chunk = pull(iterator)
+        if chunk is not None:
+            buffers[i] = chunk
+    while buffers:
+        bound = min(chunk[ROW_COLUMN].iat[-1] for chunk in buffers.values())
+        parts = []
+        for i, chunk in list(buffers.items()):
+            cut = int(np.searchsorted(chunk[ROW_COLUMN].to_numpy(), bound, side="right"))
+            parts.append(chunk.iloc[:cut])
+            if cut < len(chunk):
+                buffers[i] = chunk.iloc[cut:]
+            else:
+                following = pull(iterators[i])
+                if following is None:
+                    del buffers[i]
+                else:
+                    buffers[i] = following
+        yield pd.concat(parts, ignore_index=True).sort_values(ROW_COLUMN, kind="stable", ignore_index=True)
+
+
+class PartitionedAnalysis:
+    """
+    Ejecuta limpieza, puntuación de sentimiento y agregación por libro en
+    modo map-reduce:
+
+        1. Particiona las reseñas del CSV por hash del título en
+           `partitions` carpetas de archivos Parquet.
+        2. Procesa cada partición en un proceso trabajador: limpia nulos y
+           duplicados, puntúa el sentimiento y calcula las estadísticas por
+           libro (conteos, sumas, extremos).
+        3. Combina los resultados parciales: las estadísticas se fusionan
+           en un `BookAggregateStore` y las reseñas puntuadas, que cada
+           partición escribe en orden de fila, se mezclan en streaming
+           (k-way) en el orden original del CSV.
+
+    Como un libro vive en una sola partición y sus duplicados también, el
+    resultado coincide con el del camino en un solo proceso (`stream_csv`
+    + `calculate_sentiments` + `BookAggregateStore.update`).
+
+    Attributes:
+        file_path (str): CSV de reseñas.
+        output_dir (str): Carpeta de trabajo y de resultados.
+        workers (int): Número de procesos trabajadores.
+        partitions (int): Número de particiones.
+        backend (str): Backend de sentimiento.
+        chunksize (int): Filas por bloque de lectura.
+    """
+    def __init__(
+        self,
+        file_path: str,
+        output_dir: str,
+        workers: int = None,
+        partitions: int = None,
+        backend: str = "textblob",
+        chunksize: int = DEFAULT_CHUNKSIZE,
+    ):
+        """
+        Args:
+            file_path (str): CSV de reseñas.
+            output_dir (str): Carpeta de trabajo y de resultados.
+            workers (int, optional): Número de procesos. Por defecto, `os.cpu_count()`.
+            partitions (int, optional): Número de particiones. Por defecto, el doble
+                de `workers`, para repartir mejor las particiones desparejas.
+            backend (str): Backend de sentimiento. Por defecto, "textblob".
+            chunksize (int): Filas por bloque de lectura.
+
+        Raises:
+            ValueError: Si `workers` o `partitions` no son positivos.
+        """
+        self.file_path = file_path
+        self.output_dir = output_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.partitions = partitions or 2 * self.workers
+        if self.workers < 1 or self.partitions < 1:
+            raise ValueError("'workers' y 'partitions' deben ser enteros positivos.")
+        self.backend = backend
+        self.chunksize = chunksize
+
+    def _partition_dir(self, partition: int) -> str:
+        return os.path.join(self.output_dir, "partitions", f"part-{partition:04d}")
+
+    @instrument()
+    def partition(self) -> int:
+        """
+        Lee el CSV por bloques y escribe cada reseña en la carpeta de su
+        partición (un archivo Parquet por bloque y partición).
+
+        Returns:
+            int: Número de reseñas leídas.
+        """
+        shutil.rmtree(os.path.join(self.output_dir, "partitions"), ignore_errors=True)
+        loader = cargar_data(self.file_path)
+        rows = 0
+        for number, chunk in enumerate(
+            loader.load_csv_chunks(self.chunksize, usecols=REVIEW_COLUMNS, dtype=REVIEW_DTYPES)
+        ):
+            chunk[ROW_COLUMN] = np.arange(rows, rows + len(chunk), dtype=np.int64)
+            rows += len(chunk)
+            ids = partition_ids(chunk["Title"], self.partitions)
+            order = np.argsort(ids, kind="stable")
+            bounds = np.searchsorted(ids[order], np.arange(self.partitions + 1))
+            for partition in range(self.partitions):
+                positions = order[bounds[partition]:bounds[partition + 1]]
+                if len(positions):
+                    directory = self._partition_dir(partition)
+                    os.makedirs(directory, exist_ok=True)
+                    chunk.take(positions).to_parquet(os.path.join(directory, f"chunk-{number:06d}.parquet"))
+        print(f"Reseñas particionadas: {rows} filas en {self.partitions} particiones.")
+        return rows
+
+    @instrument()
+    def run(self) -> dict:
+        """
+        Ejecuta las tres fases y devuelve los resultados combinados.
+
+        Returns:
+            dict: `sentiment_path` (Parquet con las reseñas puntuadas en el
+            orden original) y `store` (`BookAggregateStore` combinado, con
+            los libros en orden de primera aparición).
+        """
+        self.partition()
+        outputs = os.path.join(self.output_dir, "scored")
+        shutil.rmtree(outputs, ignore_errors=True)
+        tasks = [
+            (self._partition_dir(p), os.path.join(outputs, f"part-{p:04d}.parquet"), self.backend, self.chunksize)
+            for p in range(self.partitions)
+            if os.path.isdir(self._partition_dir(p))
+        ]
+        if self.workers == 1:
+            results = [_process_partition(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(self.workers) as executor:
+                results = list(executor.map(_process_partition, *zip(*tasks)))
+        results = [result for result in results if result is not None]
+        return {"sentiment_path": self._reduce_reviews(outputs), "store": self._reduce_stores(results)}
+
+    def _reduce_stores(self, results: list) -> BookAggregateStore:
+        # Los libros de distintas particiones son disjuntos: basta con
+        # concatenar y ordenar por primera aparición.
+        if not results:
+            return BookAggregateStore()
+        stats = pd.concat([stats for stats, _ in results])
+        first_rows = pd.concat([rows for _, rows in results])
+        stats = stats.iloc[np.argsort(first_rows.reindex(stats.index).to_numpy(), kind="stable")]
+        stats.index.name = "book_title"
+        return BookAggregateStore(stats)
+
+    def _reduce_reviews(self, outputs: str) -> str:
+        path = os.path.join(self.output_dir, "reviews_sentiment.parquet")
+        files = sorted(glob.glob(os.path.join(outputs, "*.parquet")))
+        if not files:
+            return None
+        merged = _merge_by_row([iter_parquet(f, self.chunksize) for f in files])
+        write_parquet(
+            path,
+            (chunk.drop(columns=ROW_COLUMN).assign(Title=chunk["Title"].astype("category")) for chunk in merged),
+        )
+        return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--file", default="./src/data/books_rating.csv", help="CSV de reseñas.")
+    parser.add_argument("--output", default="./src/data/output/particiones")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--partitions", type=int, default=None)
+    parser.add_argument("--backend", default="textblob")
+    parser.add_argument("--top-n", type=int, default=10)
+    args = parser.parse_args()
+    result = PartitionedAnalysis(args.file, args.output, args.workers, args.partitions, args.backend).run()
+    rankings = TopBooksAnalysis(store=result["store"]).rank_books(top_n=args.top_n)
+    for metric, ranking in rankings.items():
+        print(f"\nTop {args.top_n} libros por {metric}:")
+        print(ranking)
+
+
+if __name__ == "__main__":
+    main()
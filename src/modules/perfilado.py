@@ -0,0 +1,241 @@
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import psutil
+
+
+class PeakRSSSampler(threading.Thread):
+    """
+    Muestrea el RSS del proceso en segundo plano y guarda el máximo.
+
+    Attributes:
+        baseline (int): RSS al crear el muestreador, en bytes.
+        peak (int): Máximo RSS observado, en bytes.
+    """
+    def __init__(self, interval: float = 0.005):
+        """
+        Args:
+            interval (float): Segundos entre muestras. Por defecto, 0.005.
+        """
+        super().__init__(daemon=True)
+        self.process = psutil.Process()
+        self.interval = interval
+        self.baseline = self.peak = self.process.memory_info().rss
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._done.wait(self.interval)
+
+    def stop(self) -> int:
+        """
+        Detiene el muestreo.
+
+        Returns:
+            int: Máximo RSS observado, en bytes.
+        """
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+        return self.peak
+
+
+class StageRecord(dict):
+    """
+    Métricas de una ejecución de una etapa. Es un `dict` para poder
+    serializarse directamente a JSON; `rows_out` puede fijarse dentro
+    del bloque `with` cuando la salida no es un DataFrame.
+    """
+
+
+def _rows(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    for attribute in ("dataframe", "data"):
+        candidate = getattr(value, attribute, None)
+        if isinstance(candidate, (pd.DataFrame, pd.Series)):
+            return len(candidate)
+    return None
+
+
+class PipelineProfiler:
+    """
+    Registro de métricas por etapa del pipeline: tiempo de pared y de CPU,
+    delta de pico de RSS, filas de entrada y salida y filas por segundo.
+
+    Desactivado, `stage` y `instrument` se reducen a una comprobación de
+    `enabled`, por lo que pueden dejarse en el código sin costo.
+
+    Attributes:
+        enabled (bool): Si se registran métricas.
+        records (list): Métricas de cada ejecución de etapa.
+        json_log (TextIO): Destino de los registros JSON (una línea por etapa),
+            o None para no emitirlos.
+        cprofile_stages (set): Etapas que se perfilan con cProfile.
+        cprofile_dir (str): Carpeta donde se guardan los `.prof`.
+    """
+    def __init__(self, enabled: bool = False, json_log=None, cprofile_stages=(), cprofile_dir: str = "."):
+        """
+        Args:
+            enabled (bool): Si se registran métricas. Por defecto, False.
+            json_log (TextIO, optional): Destino de los registros JSON.
+            cprofile_stages (Iterable[str]): Etapas a perfilar con cProfile.
+            cprofile_dir (str): Carpeta para los `.prof`. Por defecto, ".".
+        """
+        self.records = []
+        self.configure(enabled, json_log, cprofile_stages, cprofile_dir)
+
+    def configure(self, enabled: bool = True, json_log=None, cprofile_stages=(), cprofile_dir: str = "."):
+        """
+        Cambia la configuración del perfilador; ver `__init__`.
+        """
+        self.enabled = enabled
+        self.json_log = json_log
+        self.cprofile_stages = set(cprofile_stages)
+        self.cprofile_dir = cprofile_dir
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        """
+        Crea un perfilador configurado con variables de entorno:
+        `PIPELINE_PROFILE=1` lo activa, `PIPELINE_PROFILE_JSON=1` emite los
+        registros JSON por stderr y `PIPELINE_CPROFILE` lista (separadas por
+        comas) las etapas a perfilar con cProfile.
+        """
+        profiler = cls()
+        profiler.configure(
+            enabled=environ.get("PIPELINE_PROFILE", "0") not in ("", "0"),
+            json_log=sys.stderr if environ.get("PIPELINE_PROFILE_JSON", "0") not in ("", "0") else None,
+            cprofile_stages=[s for s in environ.get("PIPELINE_CPROFILE", "").split(",") if s],
+            cprofile_dir=environ.get("PIPELINE_CPROFILE_DIR", "."),
+        )
+        return profiler
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = None):
+        """
+        Mide el bloque `with` como una ejecución de la etapa `name`.
+
+        Args:
+            name (str): Nombre de la etapa.
+            rows_in (int, optional): Filas de entrada.
+
+        Yields:
+            StageRecord: Registro de la etapa (None si está desactivado).
+        """
+        if not self.enabled:
+            yield None
+            return
+        record = StageRecord(stage=name, rows_in=rows_in, rows_out=None)
+        sampler = PeakRSSSampler()
+        sampler.start()
+        profile = cProfile.Profile() if name in self.cprofile_stages else None
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile is not None:
+                profile.disable()
+            seconds = time.perf_counter() - wall_start
+            peak = sampler.stop()
+            rows = record["rows_out"] if record["rows_out"] is not None else record["rows_in"]
+            record.update(
+                rows=rows,
+                seconds=round(seconds, 6),
+                cpu_seconds=round(time.process_time() - cpu_start, 6),
+                peak_rss_delta_mb=round((peak - sampler.baseline) / 2**20, 2),
+                rows_per_sec=round(rows / seconds, 1) if rows and seconds else None,
+            )
+            self.records.append(record)
+            if profile is not None:
+                self._dump_profile(name, profile)
+            if self.json_log is not None:
+                print(json.dumps(record), file=self.json_log, flush=True)
+
+    def _dump_profile(self, name: str, profile: cProfile.Profile):
+        os.makedirs(self.cprofile_dir, exist_ok=True)
+        path = os.path.join(self.cprofile_dir, f"{name.replace('/', '_')}.prof")
+        profile.dump_stats(path)
+        output = io.StringIO()
+        pstats.Stats(profile, stream=output).sort_stats("cumulative").print_stats(15)
+        print(f"Perfil cProfile de la etapa '{name}' guardado en {path}")
+        print(output.getvalue())
+
+    def instrument(self, name: str = None):
+        """
+        Decorador que mide cada llamada a la función como una etapa. Las
+        filas de entrada se toman del primer argumento que sea (o contenga
+        en `data`/`dataframe`) un DataFrame, y las de salida del resultado.
+
+        Args:
+            name (str, optional): Nombre de la etapa. Por defecto, el nombre
+                calificado de la función.
+        """
+        def decorator(func):
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                rows_in = next((r for r in map(_rows, args) if r is not None), None)
+                with self.stage(stage_name, rows_in) as record:
+                    result = func(*args, **kwargs)
+                    record["rows_out"] = _rows(result)
+                return result
+            return wrapper
+        return decorator
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Agrega los registros por etapa.
+
+        Returns:
+            pd.DataFrame: Por etapa, llamadas, segundos de pared y CPU, máximo
+                          delta de RSS, filas procesadas y filas por segundo.
+        """
+        if not self.records:
+            return pd.DataFrame()
+        records = pd.DataFrame(self.records)
+        summary = records.groupby("stage", sort=False).agg(
+            calls=("seconds", "size"),
+            seconds=("seconds", "sum"),
+            cpu_seconds=("cpu_seconds", "sum"),
+            peak_rss_delta_mb=("peak_rss_delta_mb", "max"),
+            rows=("rows", "sum"),
+        )
+        summary["rows"] = summary["rows"].astype("int64")
+        summary["rows_per_sec"] = (summary["rows"] / summary["seconds"]).round(1)
+        return summary.sort_values("seconds", ascending=False)
+
+    def print_summary(self):
+        """
+        Imprime la tabla de `summary` si el perfilador está activo.
+        """
+        if self.enabled and self.records:
+            print("\nMétricas por etapa:")
+            print(self.summary().to_string())
+
+    def reset(self):
+        """
+        Elimina los registros acumulados.
+        """
+        self.records = []
+
+
+# Perfilador compartido por los módulos del pipeline; se activa con
+# `PROFILER.configure(...)` o con las variables de entorno de `from_env`.
+PROFILER = PipelineProfiler.from_env()
+instrument = PROFILER.instrument
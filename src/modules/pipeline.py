@@ -0,0 +1,343 @@
+import glob
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import re
+import time
+import traceback
+import types
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from . import etapas
+from .cargar_data import CLEANING_VERSION, cargar_data
+from .etapas import STAGES
+from .perfilado import PROFILER
+
+# Claves que una etapa lee de `params` (`params["x"]` o `params.get("x", ...)`).
+_PARAM_PATTERN = re.compile(r"""params(?:\.get\(|\[)\s*["']([^"']+)["']""")
+
+DEFAULT_CONFIG_PATH = "./src/static/config.json"
+
+
+def _output_paths(output) -> list:
+    # Archivos o carpetas que devuelve una etapa (directamente o como
+    # valores de un dict): el checkpoint sólo vale mientras existan.
+    values = output.values() if isinstance(output, dict) else [output]
+    return [value for value in values if isinstance(value, str) and os.path.exists(value)]
+
+
+def _execute_stage(function: str, params: dict, input_paths: dict, output_path: str) -> tuple:
+    """
+    Ejecuta una etapa leyendo sus entradas desde los checkpoints y
+    escribiendo su salida en `output_path`, junto con la lista de archivos
+    que devuelve (`<checkpoint>.json`). Vive a nivel de módulo para poder
+    ejecutarse en un proceso trabajador.
+
+    Returns:
+        tuple: (segundos de ejecución, registros de `PROFILER` generados por la etapa).
+    """
+    inputs = {}
+    for name, path in input_paths.items():
+        with open(path, "rb") as f:
+            inputs[name] = pickle.load(f)
+    first_record = len(PROFILER.records)
+    start = time.perf_counter()
+    output = STAGES[function](inputs, params)
+    seconds = time.perf_counter() - start
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output_path)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"paths": _output_paths(output)}, f)
+    os.replace(tmp_path, f"{output_path}.json")
+    return seconds, PROFILER.records[first_record:]
+
+
+def _code_sources(function) -> list:
+    """
+    Fuentes del código del que depende una etapa: la función, las funciones
+    auxiliares de `etapas.py` que usa y, transitivamente, los módulos del
+    paquete que importan. Cambiar cualquiera de ellos invalida la huella.
+    """
+    package = __name__.rsplit(".", 1)[0]
+    functions, modules = [], []
+    pending_functions, pending_modules = [function], []
+
+    def referenced(code):
+        names = set(code.co_names)
+        for constant in code.co_consts:
+            if isinstance(constant, types.CodeType):
+                names |= referenced(constant)
+        return names
+
+    while pending_functions:
+        func = pending_functions.pop()
+        if func in functions:
+            continue
+        functions.append(func)
+        for name in referenced(func.__code__):
+            value = func.__globals__.get(name)
+            module = value if isinstance(value, types.ModuleType) else inspect.getmodule(value)
+            if module is etapas and isinstance(value, types.FunctionType):
+                pending_functions.append(value)
+            elif module is not None and module is not etapas and module.__name__.startswith(f"{package}."):
+                pending_modules.append(module)
+
+    while pending_modules:
+        module = pending_modules.pop()
+        if module in modules:
+            continue
+        modules.append(module)
+        for value in vars(module).values():
+            dependency = value if isinstance(value, types.ModuleType) else inspect.getmodule(value)
+            if dependency is not None and dependency.__name__.startswith(f"{package}."):
+                pending_modules.append(dependency)
+
+    sources = [inspect.getsource(func) for func in sorted(functions, key=lambda f: f.__qualname__)]
+    sources += [inspect.getsource(module) for module in sorted(modules, key=lambda m: m.__name__)]
+    return sources
+
+
+class PipelineRunner:
+    """
+    Ejecuta el pipeline declarado en `config.json` como un grafo de etapas.
+
+    Cada etapa tiene una huella que combina el código del que depende, sus
+    parámetros, las huellas de los archivos que lee y las de sus
+    dependencias. La salida de cada etapa se guarda como checkpoint con su
+    huella; al volver a ejecutar, las etapas cuya huella no cambió se
+    omiten y su salida se lee del checkpoint sólo si otra etapa la necesita.
+    Las etapas independientes se ejecutan en paralelo en procesos separados.
+
+    Attributes:
+        config (dict): Configuración leída de `config.json`.
+        params (dict): Parámetros globales (`global.parametros`).
+        stages (dict): Declaración de cada etapa (`pipeline`).
+        checkpoint_dir (str): Carpeta de los checkpoints.
+        max_workers (int): Número máximo de etapas simultáneas.
+    """
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
+        """
+        Args:
+            config_path (str): Ruta de `config.json`.
+
+        Raises:
+            ValueError: Si una etapa declara una función o dependencia inexistente,
+                        o si el grafo tiene ciclos.
+        """
+        with open(config_path, encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.params = self.config["global"]["parametros"]
+        self.stages = self.config["pipeline"]
+        self.checkpoint_dir = self.params.get("checkpoint_dir", "./src/data/checkpoints")
+        self.max_workers = self.params.get("max_workers") or os.cpu_count() or 1
+        self.order = self._topological_order()
+        self._fingerprints = {}
+
+    def _topological_order(self) -> list:
+        for name, stage in self.stages.items():
+            if stage["funcion"] not in STAGES:
+                raise ValueError(f"La etapa '{name}' usa la función desconocida '{stage['funcion']}'.")
+            for dependency in stage.get("entradas", {}).values():
+                if dependency not in self.stages:
+                    raise ValueError(f"La etapa '{name}' depende de la etapa inexistente '{dependency}'.")
+        order, visiting = [], set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"El pipeline tiene un ciclo que pasa por la etapa '{name}'.")
+            visiting.add(name)
+            for dependency in self.stages[name].get("entradas", {}).values():
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def stage_params(self, name: str) -> dict:
+        """
+        Parámetros con que se llama a la etapa: los globales más los propios.
+        """
+        return {**self.params, **self.stages[name].get("parametros", {})}
+
+    def fingerprint(self, name: str) -> str:
+        """
+        Huella de la etapa: versión de las reglas de limpieza, código de su
+        función y de los módulos del paquete que usa (`_code_sources`),
+        parámetros propios, parámetros globales que la función lee, huella de
+        los archivos declarados en `archivos` y huellas de sus dependencias.
+        Los globales que la etapa no lee (carpeta de checkpoints, número de
+        procesos del pipeline) no forman parte de la huella.
+
+        Args:
+            name (str): Nombre de la etapa.
+
+        Returns:
+            str: Huella hexadecimal.
+        """
+        if name not in self._fingerprints:
+            stage = self.stages[name]
+            function = STAGES[stage["funcion"]]
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"cleaning_version:{CLEANING_VERSION}".encode())
+            sources = _code_sources(function)
+            for source in sources:
+                digest.update(source.encode())
+            read = set(_PARAM_PATTERN.findall("\n".join(sources)))
+            params = self.stage_params(name)
+            used = {key: params[key] for key in sorted(read) if key in params}
+            used.update(stage.get("parametros", {}))
+            digest.update(json.dumps(used, sort_keys=True, default=str).encode())
+            for key in stage.get("archivos", []):
+                path = self.params[key]
+                source = cargar_data(path)._source_fingerprint() if os.path.exists(path) else "missing"
+                digest.update(f"{key}:{source}".encode())
+            for argument, dependency in sorted(stage.get("entradas", {}).items()):
+                digest.update(f"{argument}:{self.fingerprint(dependency)}".encode())
+            self._fingerprints[name] = digest.hexdigest()
+        return self._fingerprints[name]
+
+    def checkpoint_path(self, name: str) -> str:
+        """
+        Ruta del checkpoint de la etapa para su huella actual.
+        """
+        return os.path.join(self.checkpoint_dir, f"{name}-{self.fingerprint(name)}.pkl")
+
+    def output(self, name: str):
+        """
+        Lee la salida de una etapa desde su checkpoint.
+
+        Args:
+            name (str): Nombre de la etapa.
+
+        Returns:
+            object: Salida de la etapa.
+
+        Raises:
+            FileNotFoundError: Si la etapa no tiene un checkpoint vigente.
+        """
+        with open(self.checkpoint_path(name), "rb") as f:
+            return pickle.load(f)
+
+    def _checkpoint_valid(self, name: str) -> bool:
+        # Las etapas que devuelven rutas (cachés Parquet, gráficos, carpetas)
+        # se reejecutan si alguna de las registradas al ejecutarlas ya no existe.
+        path = self.checkpoint_path(name)
+        try:
+            with open(f"{path}.json", encoding="utf-8") as f:
+                paths = json.load(f)["paths"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return False
+        return os.path.exists(path) and all(os.path.exists(output) for output in paths)
+
+    def _required(self, targets) -> list:
+        if targets is None:
+            return list(self.order)
+        required = set()
+
+        def collect(name):
+            if name not in self.stages:
+                raise ValueError(f"La etapa '{name}' no existe en el pipeline.")
+            if name not in required:
+                required.add(name)
+                for dependency in self.stages[name].get("entradas", {}).values():
+                    collect(dependency)
+
+        for target in targets:
+            collect(target)
+        return [name for name in self.order if name in required]
+
+    def _submit(self, executor, name: str):
+        stage = self.stages[name]
+        input_paths = {
+            argument: self.checkpoint_path(dependency)
+            for argument, dependency in stage.get("entradas", {}).items()
+        }
+        args = (stage["funcion"], self.stage_params(name), input_paths, self.checkpoint_path(name))
+        if executor is None:
+            return _execute_stage(*args)
+        return executor.submit(_execute_stage, *args)
+
+    def _cleanup(self, name: str):
+        current = self.checkpoint_path(name)
+        for path in glob.glob(os.path.join(self.checkpoint_dir, f"{name}-*.pkl*")):
+            if path not in (current, f"{current}.json"):
+                os.remove(path)
+
+    def run(self, targets=None, force=()) -> dict:
+        """
+        Ejecuta las etapas necesarias para `targets` (todas por defecto),
+        omitiendo las que tienen un checkpoint vigente.
+
+        Args:
+            targets (Iterable[str], optional): Etapas a obtener.
+            force (Iterable[str]): Etapas a ejecutar aunque no hayan cambiado.
+                Sus dependientes también se ejecutan.
+
+        Returns:
+            dict: Etapa → estado ("omitida", "ejecutada", "fallida" u "omitida por falla").
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        names = self._required(targets)
+        forced = set(force)
+        status, pending = {}, []
+        for name in names:
+            upstream_forced = any(
+                dependency in forced for dependency in self.stages[name].get("entradas", {}).values()
+            )
+            if upstream_forced:
+                forced.add(name)
+            if name not in forced and self._checkpoint_valid(name):
+                status[name] = "omitida"
+                print(f"[pipeline] {name}: sin cambios, se usa el checkpoint.")
+            else:
+                pending.append(name)
+
+        executor = ProcessPoolExecutor(self.max_workers) if self.max_workers > 1 else None
+        running = {}
+        try:
+            while pending or running:
+                for name in list(pending):
+                    dependencies = self.stages[name].get("entradas", {}).values()
+                    if any(status.get(d) in ("fallida", "omitida por falla") for d in dependencies):
+                        pending.remove(name)
+                        status[name] = "omitida por falla"
+                        print(f"[pipeline] {name}: no se ejecuta porque falló una dependencia.")
+                    elif all(status.get(d) in ("omitida", "ejecutada") for d in dependencies):
+                        pending.remove(name)
+                        print(f"[pipeline] {name}: ejecutando...")
+                        if executor is None:
+                            self._finish(name, status, lambda n=name: self._submit(None, n), local=True)
+                        else:
+                            running[self._submit(executor, name)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._finish(running.pop(future), status, future.result)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return status
+
+    def _finish(self, name: str, status: dict, result, local: bool = False):
+        try:
+            seconds, records = result()
+        except Exception:
+            status[name] = "fallida"
+            print(f"[pipeline] {name}: falló.\n{traceback.format_exc()}")
+            return
+        # Los registros de un proceso trabajador no llegan solos al perfilador
+        # de este proceso; los de una etapa ejecutada aquí ya están en él.
+        if not local:
+            PROFILER.records.extend(records)
+        status[name] = "ejecutada"
+        self._cleanup(name)
+        print(f"[pipeline] {name}: ejecutada en {seconds:.2f} s.")
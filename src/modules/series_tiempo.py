@@ -0,0 +1,311 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from .perfilado import instrument
+
+# Estadísticas diarias guardadas por llave; todas son sumas, así que se
+# combinan entre bloques, particiones y períodos sumando.
+TREND_FIELDS = [
+    "review_count",
+    "rating_count", "rating_sum", "rating_sumsq",
+    "sentiment_count", "sentiment_sum", "sentiment_sumsq",
+]
+FREQUENCIES = ("D", "M")
+
+
+def _month(days: pd.Series) -> pd.Series:
+    return days.dt.strftime("%Y-%m")
+
+
+class TimeSeriesStore:
+    """
+    Agregados diarios por libro (conteo, sumas y sumas de cuadrados de
+    puntaje y sentimiento) guardados en un archivo Parquet por mes
+    (`AAAA-MM.parquet`).
+
+    Las consultas por rango de fechas sólo leen los meses del rango, y
+    agregar reseñas nuevas sólo reescribe los meses que esas reseñas tocan.
+
+    Attributes:
+        directory (str): Carpeta de las particiones mensuales.
+    """
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Carpeta de las particiones mensuales.
+        """
+        self.directory = directory
+
+    @staticmethod
+    def bucket(
+        reviews: pd.DataFrame,
+        key_column: str = "Title",
+        time_column: str = "review/time",
+        rating_column: str = "review/score",
+        sentiment_column: str = "sentiment_score",
+    ) -> pd.DataFrame:
+        """
+        Agrupa reseñas por llave y día.
+
+        Args:
+            reviews (pd.DataFrame): Reseñas con fecha en segundos epoch.
+            key_column (str): Columna con la llave (título del libro).
+            time_column (str): Columna con la fecha en segundos epoch.
+            rating_column (str): Columna con el puntaje. Puede no existir.
+            sentiment_column (str): Columna con el sentimiento. Puede no existir.
+
+        Returns:
+            pd.DataFrame: Columnas `key`, `day` y `TREND_FIELDS`.
+        """
+        values = pd.DataFrame({
+            "key": reviews[key_column].astype(str).to_numpy(),
+            "day": pd.to_datetime(reviews[time_column].to_numpy(), unit="s").floor("D"),
+            "review_count": 1,
+        })
+        for metric, column in (("rating", rating_column), ("sentiment", sentiment_column)):
+            metric_values = (
+                reviews[column].astype("float64").to_numpy() if column in reviews.columns
+                else np.full(len(reviews), np.nan)
+            )
+            values[f"{metric}_count"] = ~np.isnan(metric_values)
+            values[f"{metric}_sum"] = np.nan_to_num(metric_values)
+            values[f"{metric}_sumsq"] = np.nan_to_num(metric_values) ** 2
+        return values.groupby(["key", "day"], sort=False, as_index=False)[TREND_FIELDS].sum()
+
+    @staticmethod
+    def _combine(frames) -> pd.DataFrame:
+        return pd.concat(frames, ignore_index=True).groupby(["key", "day"], sort=False, as_index=False)[TREND_FIELDS].sum()
+
+    def _path(self, month: str) -> str:
+        return os.path.join(self.directory, f"{month}.parquet")
+
+    def months(self) -> list:
+        """
+        Meses con partición, en orden.
+        """
+        return sorted(os.path.basename(p)[:-len(".parquet")] for p in glob.glob(self._path("*")))
+
+    def _write(self, month: str, buckets: pd.DataFrame):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(month)}.tmp"
+        buckets.sort_values(["day", "key"], ignore_index=True).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self._path(month))
+
+    @instrument()
+    def build(self, chunks, **columns) -> list:
+        """
+        Reconstruye todas las particiones a partir de bloques de reseñas
+        (por ejemplo, la salida de la etapa de sentimiento).
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Bloques de reseñas.
+            **columns: Nombres de columnas, como en `bucket`.
+
+        Returns:
+            list: Meses escritos.
+        """
+        buckets = self._combine([self.bucket(chunk, **columns) for chunk in chunks])
+        for stale in glob.glob(self._path("*")):
+            os.remove(stale)
+        months = _month(buckets["day"])
+        for month, group in buckets.groupby(months.to_numpy(), sort=True):
+            self._write(month, group)
+        print(f"Series de tiempo: {len(buckets)} buckets diarios en {months.nunique()} meses.")
+        return sorted(months.unique())
+
+    @instrument()
+    def append(self, reviews: pd.DataFrame, **columns) -> list:
+        """
+        Agrega reseñas nuevas. Sólo se leen y reescriben las particiones
+        de los meses que aparecen en `reviews`.
+
+        Args:
+            reviews (pd.DataFrame): Reseñas nuevas.
+            **columns: Nombres de columnas, como en `bucket`.
+
+        Returns:
+            list: Meses reescritos.
+        """
+        buckets = self.bucket(reviews, **columns)
+        months = _month(buckets["day"])
+        touched = []
+        for month, group in buckets.groupby(months.to_numpy(), sort=True):
+            path = self._path(month)
+            if os.path.exists(path):
+                group = self._combine([pd.read_parquet(path), group])
+            self._write(month, group)
+            touched.append(month)
+        print(f"Series de tiempo: meses actualizados {touched}")
+        return touched
+
+    def read(self, start=None, end=None, keys: pd.Series = None) -> pd.DataFrame:
+        """
+        Lee los buckets diarios de `[start, end)` leyendo sólo los meses del rango.
+
+        Args:
+            start (str | pd.Timestamp, optional): Fecha inicial (incluida).
+            end (str | pd.Timestamp, optional): Fecha final (excluida).
+            keys (pd.Series, optional): Título → otra llave (autor, categoría);
+                los buckets se reagrupan por esa llave y se descartan los
+                títulos sin llave. Un título repetido suma sus buckets a
+                cada una de sus llaves.
+
+        Returns:
+            pd.DataFrame: Columnas `key`, `day` y `TREND_FIELDS`.
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        first = start.strftime("%Y-%m") if start is not None else ""
+        last = (end - pd.Timedelta(days=1)).strftime("%Y-%m") if end is not None else "9999-99"
+        frames = [pd.read_parquet(self._path(m)) for m in self.months() if first <= m <= last]
+        if not frames:
+            return pd.DataFrame(columns=["key", "day", *TREND_FIELDS])
+        data = pd.concat(frames, ignore_index=True)
+        mask = np.ones(len(data), dtype=bool)
+        if start is not None:
+            mask &= (data["day"] >= start).to_numpy()
+        if end is not None:
+            mask &= (data["day"] < end).to_numpy()
+        data = data[mask]
+        if keys is not None:
+            keys = pd.DataFrame({"key": keys.index.astype(str), "new_key": keys.to_numpy()}).dropna()
+            data = data.assign(key=data["key"].astype(str)).merge(keys, on="key")
+            data = self._combine([data.drop(columns="key").rename(columns={"new_key": "key"})])
+        return data.reset_index(drop=True)
+
+
+def _derive(stats: pd.DataFrame) -> pd.DataFrame:
+    # Promedios a partir de sumas; un conteo de 0 deja el promedio nulo.
+    result = stats.copy()
+    for metric in ("rating", "sentiment"):
+        count = result[f"{metric}_count"].replace(0, np.nan)
+        result[f"average_{metric}"] = result[f"{metric}_sum"] / count
+    return result
+
+
+class TimeSeriesAnalysis:
+    """
+    Tendencias de puntaje, sentimiento y volumen de reseñas en el tiempo,
+    calculadas sobre un `TimeSeriesStore`.
+
+    Attributes:
+        store (TimeSeriesStore): Agregados diarios particionados por mes.
+    """
+    def __init__(self, store: TimeSeriesStore):
+        """
+        Args:
+            store (TimeSeriesStore): Agregados diarios particionados por mes.
+        """
+        self.store = store
+
+    @instrument()
+    def series(self, freq: str = "M", start=None, end=None, keys: pd.Series = None) -> pd.DataFrame:
+        """
+        Serie por llave y período (día o mes) con conteos y promedios.
+
+        Args:
+            freq (str): "D" (día) o "M" (mes). Por defecto, "M".
+            start, end: Rango de fechas `[start, end)`, opcional.
+            keys (pd.Series, optional): Título → autor/categoría, como en `TimeSeriesStore.read`.
+
+        Returns:
+            pd.DataFrame: Columnas `key`, `period`, `TREND_FIELDS`,
+            `average_rating` y `average_sentiment`, ordenadas por llave y período.
+
+        Raises:
+            ValueError: Si la frecuencia no es soportada.
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Frecuencia '{freq}' no soportada; use una de {FREQUENCIES}.")
+        data = self.store.read(start, end, keys)
+        period = data["day"].dt.to_period(freq).dt.to_timestamp() if len(data) else data["day"]
+        grouped = data.assign(period=period).groupby(["key", "period"], sort=True, as_index=False)[TREND_FIELDS].sum()
+        return _derive(grouped)
+
+    @instrument()
+    def rolling_means(self, window: str = "30D", start=None, end=None, keys: pd.Series = None) -> pd.DataFrame:
+        """
+        Promedios móviles por llave sobre una ventana de tiempo. Los
+        promedios se ponderan por reseña: la suma móvil de puntajes se
+        divide por el conteo móvil, no se promedian promedios diarios.
+
+        Args:
+            window (str): Ventana de pandas, p. ej. "7D" o "30D". Por defecto, "30D".
+            start, end: Rango de fechas `[start, end)`, opcional.
+            keys (pd.Series, optional): Título → autor/categoría.
+
+        Returns:
+            pd.DataFrame: Por llave y día con reseñas: `review_count`, `average_rating`
+            y `average_sentiment` de la ventana que termina ese día.
+        """
+        data = self.store.read(start, end, keys).sort_values(["key", "day"], ignore_index=True)
+        sums = ["review_count", "rating_count", "rating_sum", "sentiment_count", "sentiment_sum"]
+        rolling = (
+            data.set_index("day").groupby("key", sort=False)[sums].rolling(window).sum().reset_index()
+        )
+        rolling = _derive(rolling)
+        return rolling[["key", "day", "review_count", "average_rating", "average_sentiment"]]
+
+    @instrument()
+    def velocity(self, window_days: int = 90, end=None, keys: pd.Series = None) -> pd.DataFrame:
+        """
+        Velocidad de reseñas por llave: reseñas por día en la ventana de
+        `window_days` días que termina en `end` y en la ventana anterior.
+
+        Args:
+            window_days (int): Largo de la ventana en días. Por defecto, 90.
+            end (str | pd.Timestamp, optional): Fin (excluido) de la ventana. Por
+                defecto, el día siguiente al último día con datos.
+            keys (pd.Series, optional): Título → autor/categoría.
+
+        Returns:
+            pd.DataFrame: Columnas `key`, `review_count`, `previous_count`,
+            `velocity`, `previous_velocity`, `growth`, `average_rating` y
+            `average_sentiment` (de la ventana actual).
+        """
+        end = pd.Timestamp(end) if end is not None else self._last_day() + pd.Timedelta(days=1)
+        window = pd.Timedelta(days=window_days)
+        data = self.store.read(end - 2 * window, end, keys)
+        current = (data["day"] >= end - window).to_numpy()
+        now = data[current].groupby("key", sort=False)[TREND_FIELDS].sum()
+        before = data[~current].groupby("key", sort=False)["review_count"].sum()
+        result = _derive(now)
+        result["previous_count"] = before.reindex(result.index, fill_value=0)
+        result["velocity"] = result["review_count"] / window_days
+        result["previous_velocity"] = result["previous_count"] / window_days
+        # Crecimiento relativo con suavizado de +1 para llaves sin reseñas previas.
+        result["growth"] = (result["review_count"] - result["previous_count"]) / (result["previous_count"] + 1)
+        columns = ["review_count", "previous_count", "velocity", "previous_velocity", "growth",
+                   "average_rating", "average_sentiment"]
+        return result[columns].reset_index()
+
+    @instrument()
+    def trending(self, window_days: int = 90, top_n: int = 10, min_reviews: int = 5, end=None,
+                 metric: str = "growth", keys: pd.Series = None) -> pd.DataFrame:
+        """
+        Top-N de llaves en tendencia en la ventana de `window_days` días.
+
+        Args:
+            window_days (int): Largo de la ventana en días. Por defecto, 90.
+            top_n (int): Número de llaves a devolver. Por defecto, 10.
+            min_reviews (int): Mínimo de reseñas en la ventana. Por defecto, 5.
+            end (str | pd.Timestamp, optional): Fin (excluido) de la ventana.
+            metric (str): Columna de `velocity` por la cual ordenar. Por defecto, "growth".
+            keys (pd.Series, optional): Título → autor/categoría.
+
+        Returns:
+            pd.DataFrame: Las filas de `velocity` con mayor `metric`.
+        """
+        velocity = self.velocity(window_days, end, keys)
+        velocity = velocity[velocity["review_count"] >= min_reviews]
+        print(f"Top {top_n} en tendencia en los últimos {window_days} días calculado.")
+        return velocity.nlargest(top_n, metric).reset_index(drop=True)
+
+    def _last_day(self) -> pd.Timestamp:
+        months = self.store.months()
+        if not months:
+            return pd.Timestamp.now().floor("D")
+        return pd.read_parquet(self.store._path(months[-1]), columns=["day"])["day"].max()
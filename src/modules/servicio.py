@@ -0,0 +1,204 @@
+"""
+API HTTP local de consultas sobre la instantánea de agregados.
+
+Ejecución desde la raíz del repositorio:
+
+    python -m src.modules.servicio --snapshot ./src/data/output/snapshot --port 8050
+
+Rutas:
+    GET /health
+    GET /top/<books|authors|categories>?metric=review_count&n=10&min_reviews=1
+    GET /books/<título>
+    GET /search?prefix=<prefijo>&limit=20
+"""
+import argparse
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Flask, Response, jsonify, request
+from waitress import serve as waitress_serve
+
+from .instantanea import MANIFEST, StatsSnapshot
+
+DEFAULT_SNAPSHOT_DIR = "./src/data/output/snapshot"
+DEFAULT_CACHE_SIZE = 1024
+# Cada cuántos segundos, como máximo, se revisa si hay una instantánea nueva.
+DEFAULT_RELOAD_INTERVAL = 1.0
+
+
+class QueryService:
+    """
+    Mantiene la instantánea vigente en memoria y responde consultas como
+    JSON ya serializado, con caché LRU de respuestas.
+
+    Antes de responder se revisa (a lo sumo cada `reload_interval`
+    segundos) la fecha de `manifest.json`; si cambió, se carga la nueva
+    instantánea y se vacía la caché. Mientras se carga, las demás
+    peticiones siguen usando la instantánea anterior.
+
+    Attributes:
+        directory (str): Carpeta de las instantáneas.
+        snapshot (StatsSnapshot): Instantánea vigente.
+        hits (int): Respuestas servidas desde la caché.
+        misses (int): Respuestas calculadas.
+    """
+    def __init__(self, directory: str = DEFAULT_SNAPSHOT_DIR, cache_size: int = DEFAULT_CACHE_SIZE,
+                 reload_interval: float = DEFAULT_RELOAD_INTERVAL):
+        """
+        Args:
+            directory (str): Carpeta de las instantáneas.
+            cache_size (int): Máximo de respuestas en caché. Por defecto, 1024.
+            reload_interval (float): Segundos entre revisiones de `manifest.json`.
+        """
+        self.directory = directory
+        self.cache_size = cache_size
+        self.reload_interval = reload_interval
+        self.hits = self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._checked = time.monotonic()
+        self._mtime = self._manifest_mtime()
+        self.snapshot = StatsSnapshot.load(directory)
+
+    def _manifest_mtime(self):
+        try:
+            return os.stat(os.path.join(self.directory, MANIFEST)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Carga la instantánea nueva si `manifest.json` cambió.
+
+        Args:
+            force (bool): Revisa aunque no haya pasado `reload_interval`.
+
+        Returns:
+            bool: True si se cargó una instantánea nueva.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked < self.reload_interval:
+            return False
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked = now
+            mtime = self._manifest_mtime()
+            if mtime is None or mtime == self._mtime:
+                return False
+            snapshot = StatsSnapshot.load(self.directory)
+            with self._lock:
+                self.snapshot, self._mtime = snapshot, mtime
+                self._cache.clear()
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def query(self, kind: str, **args) -> str:
+        """
+        Responde una consulta de la instantánea como JSON.
+
+        Args:
+            kind (str): "top", "book" o "search".
+            **args: Argumentos del método correspondiente de `StatsSnapshot`.
+
+        Returns:
+            str: Filas resultantes en JSON (lista de objetos).
+        """
+        self.refresh()
+        snapshot = self.snapshot
+        key = (snapshot.version, kind, tuple(sorted(args.items())))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+        result = getattr(snapshot, kind)(**args).to_json(orient="records", force_ascii=False)
+        with self._lock:
+            self.misses += 1
+            if snapshot is self.snapshot:
+                self._cache[key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def stats(self) -> dict:
+        """
+        Versión vigente y uso de la caché.
+        """
+        return {
+            "version": self.snapshot.version,
+            "cache_entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def create_app(service: QueryService) -> Flask:
+    """
+    Crea la aplicación Flask con las rutas de consulta.
+
+    Args:
+        service (QueryService): Servicio que responde las consultas.
+
+    Returns:
+        Flask: Aplicación lista para servirse con waitress.
+    """
+    app = Flask(__name__)
+
+    def respond(kind: str, **args):
+        try:
+            return Response(service.query(kind, **args), mimetype="application/json")
+        except ValueError as e:
+            return jsonify(error=str(e)), 400
+
+    @app.get("/health")
+    def health():
+        service.refresh()
+        return jsonify(service.stats())
+
+    @app.get("/top/<entity>")
+    def top(entity):
+        return respond(
+            "top",
+            entity=entity,
+            metric=request.args.get("metric", "review_count"),
+            top_n=request.args.get("n", 10, type=int),
+            min_reviews=request.args.get("min_reviews", 1, type=int),
+        )
+
+    @app.get("/books/<path:title>")
+    def book(title):
+        return respond("book", title=title)
+
+    @app.get("/search")
+    def search():
+        return respond("search", prefix=request.args.get("prefix", ""), limit=request.args.get("limit", 20, type=int))
+
+    return app
+
+
+def serve(directory: str = DEFAULT_SNAPSHOT_DIR, host: str = "127.0.0.1", port: int = 8050, threads: int = 4):
+    """
+    Sirve la API con waitress.
+    """
+    app = create_app(QueryService(directory))
+    print(f"API de consultas escuchando en http://{host}:{port}")
+    waitress_serve(app, host=host, port=port, threads=threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT_DIR, help="Carpeta de las instantáneas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    serve(args.snapshot, args.host, args.port, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 import pandas as pd
 
+from .agregados import BookAggregateStore
+from .perfilado import instrument
+
+RANKING_METRICS = ("review_count", "average_rating", "average_sentiment")
+
 
 class TopBooksAnalysis:
     """
@@ -7,16 +12,21 @@ class TopBooksAnalysis:
 
     Attributes:
         data (pd.DataFrame): DataFrame que contiene los datos de análisis.
+        store (BookAggregateStore): Agregados por libro precalculados. Si existe,
+            los métodos top-N responden desde él sin recorrer las reseñas.
     """
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame = None, store: BookAggregateStore = None):
         """
         Constructor para inicializar el DataFrame de análisis.
 
         Args:
             data (pd.DataFrame): DataFrame que contiene los datos a analizar.
+            store (BookAggregateStore, optional): Agregados por libro precalculados.
         """
-        self.data = data
+        self.data = data if data is not None else pd.DataFrame()
+        self.store = store
 
+    @instrument()
     def top_books_by_reviews(self, top_n=10):
         """
         Identifica los libros con mayor número de reseñas.
@@ -28,6 +38,10 @@ class TopBooksAnalysis:
             pd.DataFrame: DataFrame con los títulos de los libros y el número de reseñas.
                           Contiene dos columnas: 'book_title' y 'review_count'.
         """
+        if self.store is not None:
+            books_by_reviews = self.store.top_n("review_count", top_n).reset_index(drop=True)
+            print(f"Top {top_n} libros por número de reseñas calculados.")
+            return books_by_reviews
         if "book_title" in self.data.columns:
             books_by_reviews = (
                 self.data["book_title"].value_counts().head(top_n).reset_index()
@@ -39,6 +53,7 @@ class TopBooksAnalysis:
             print("Error: La columna 'book_title' no se encuentra en los datos.")
             return None
 
+    @instrument()
     def top_books_by_average_rating(self, top_n=10):
         """
         Identifica los libros mejor valorados por promedio de puntaje.
@@ -50,12 +65,14 @@ class TopBooksAnalysis:
             pd.DataFrame: DataFrame con los títulos de los libros y su promedio de puntaje.
                           Contiene dos columnas: 'book_title' y 'average_rating'.
         """
+        if self.store is not None:
+            top_books = self.store.top_n("average_rating", top_n)
+            print(f"Top {top_n} libros por promedio de puntaje calculados.")
+            return top_books
         if "book_title" in self.data.columns and "rating" in self.data.columns:
             avg_rating = self.data.groupby("book_title")["rating"].mean().reset_index()
             avg_rating.rename(columns={"rating": "average_rating"}, inplace=True)
-            top_books = avg_rating.sort_values(
-                by="average_rating", ascending=False
-            ).head(top_n)
+            top_books = avg_rating.nlargest(top_n, "average_rating")
             print(f"Top {top_n} libros por promedio de puntaje calculados.")
             return top_books
         else:
@@ -64,18 +81,26 @@ class TopBooksAnalysis:
             )
             return None
 
-    def top_books_by_sentiment(self, sentiment_data: pd.DataFrame, top_n=10):
+    @instrument()
+    def top_books_by_sentiment(self, sentiment_data: pd.DataFrame = None, top_n=10):
         """
         Identifica los libros mejor valorados por promedio de sentimiento.
 
         Args:
-            sentiment_data (pd.DataFrame): DataFrame que contiene las columnas 'book_title' y 'sentiment'.
+            sentiment_data (pd.DataFrame, optional): DataFrame que contiene las columnas
+                'book_title' y 'sentiment'. No se necesita si hay un `store`.
             top_n (int): Número de libros a devolver. Por defecto, 10.
 
         Returns:
             pd.DataFrame: DataFrame con los títulos de los libros y su promedio de sentimiento.
                           Contiene dos columnas: 'book_title' y 'average_sentiment'.
         """
+        if self.store is not None and sentiment_data is None:
+            top_books = self.store.top_n("average_sentiment", top_n)
+            print(f"Top {top_n} libros por promedio de sentimiento calculados.")
+            return top_books
+        if sentiment_data is None:
+            sentiment_data = self.data
         if (
             "book_title" in sentiment_data.columns
             and "sentiment" in sentiment_data.columns
@@ -86,9 +111,7 @@ class TopBooksAnalysis:
             avg_sentiment.rename(
                 columns={"sentiment": "average_sentiment"}, inplace=True
             )
-            top_books = avg_sentiment.sort_values(
-                by="average_sentiment", ascending=False
-            ).head(top_n)
+            top_books = avg_sentiment.nlargest(top_n, "average_sentiment")
             print(f"Top {top_n} libros por promedio de sentimiento calculados.")
             return top_books
         else:
@@ -97,3 +120,99 @@ class TopBooksAnalysis:
             )
             return None
 
+    def book_metrics(self) -> pd.DataFrame:
+        """
+        Calcula en una sola pasada agrupada el número de reseñas y los
+        promedios de puntaje y sentimiento de cada libro. Si hay un
+        `store`, las métricas se derivan de él sin recorrer las reseñas.
+
+        Returns:
+            pd.DataFrame: Columnas `book_title`, `review_count`, `average_rating`
+                          y `average_sentiment` (NaN si falta la columna de origen).
+                          Devuelve None si falta la columna `book_title`.
+        """
+        if self.store is not None:
+            return self.store.summary()[["book_title", *RANKING_METRICS]]
+        if "book_title" not in self.data.columns:
+            print("Error: La columna 'book_title' no se encuentra en los datos.")
+            return None
+        aggregations = {"review_count": ("book_title", "size")}
+        for column, metric in (("rating", "average_rating"), ("sentiment", "average_sentiment")):
+            if column in self.data.columns:
+                aggregations[metric] = (column, "mean")
+        metrics = self.data.groupby("book_title", sort=False).agg(**aggregations)
+        return metrics.reindex(columns=list(RANKING_METRICS)).reset_index()
+
+    @instrument()
+    def rank_books(
+        self,
+        metrics=RANKING_METRICS,
+        top_n=10,
+        min_reviews=1,
+        bayesian=False,
+        prior_weight=None,
+    ):
+        """
+        Devuelve varios rankings de libros a partir de una sola pasada
+        agrupada (`book_metrics`), seleccionando el top-N de cada métrica
+        con `nlargest` en lugar de ordenar todos los libros.
+
+        Args:
+            metrics (Iterable[str]): Métricas a rankear, entre `review_count`,
+                `average_rating` y `average_sentiment`. Por defecto, las tres.
+            top_n (int): Número de libros por ranking. Por defecto, 10.
+            min_reviews (int): Mínimo de reseñas para entrar en los rankings de
+                promedios. Por defecto, 1.
+            bayesian (bool): Si se usa el promedio bayesiano
+                `(C * m + n * promedio) / (C + n)`, donde `m` es el promedio global
+                y `C` el peso del prior, para que los libros con pocas reseñas no
+                dominen. Por defecto, False.
+            prior_weight (float, optional): Peso `C` del prior. Por defecto, la
+                mediana del número de reseñas por libro.
+
+        Returns:
+            dict: Métrica → DataFrame con las columnas `book_title`, la métrica y
+                  `review_count`. Con `bayesian`, los rankings de promedios se
+                  ordenan por la columna `bayesian_<métrica>` (el promedio
+                  ajustado), y la métrica conserva el promedio simple. Devuelve
+                  None si faltan las columnas necesarias.
+
+        Raises:
+            ValueError: Si se pide una métrica no soportada.
+        """
+        unknown = set(metrics) - set(RANKING_METRICS)
+        if unknown:
+            raise ValueError(f"Métricas no soportadas: {sorted(unknown)}. Opciones: {RANKING_METRICS}.")
+        book_metrics = self.book_metrics()
+        if book_metrics is None:
+            return None
+
+        counts = book_metrics["review_count"]
+        if prior_weight is None:
+            prior_weight = float(counts.median()) if len(counts) else 0.0
+        eligible = book_metrics[counts >= min_reviews]
+
+        rankings = {}
+        for metric in metrics:
+            columns = ["book_title", metric]
+            if metric == "review_count":
+                ranking = book_metrics.nlargest(top_n, metric)
+            else:
+                candidates = eligible.dropna(subset=[metric])
+                order_by = metric
+                if bayesian:
+                    # El promedio ajustado va en su propia columna; `metric`
+                    # conserva el promedio simple.
+                    n = candidates["review_count"]
+                    global_mean = (candidates[metric] * n).sum() / n.sum() if len(n) else 0.0
+                    order_by = f"bayesian_{metric}"
+                    candidates = candidates.assign(**{
+                        order_by: (prior_weight * global_mean + n * candidates[metric])
+                        / (prior_weight + n)
+                    })
+                    columns.append(order_by)
+                ranking = candidates.nlargest(top_n, order_by)
+                columns.append("review_count")
+            rankings[metric] = ranking[columns].reset_index(drop=True)
+        print(f"Rankings top {top_n} calculados: {', '.join(rankings)}.")
+        return rankings
@@ -1,81 +1,333 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import seaborn as sns
 import pandas as pd
 
+from .columnas_lista import entity_counts, entity_means, explode_list_column
+from .perfilado import instrument
+
+IMAGE_FORMATS = ("png", "svg")
+SENTIMENT_RANGE = (-1.0, 1.0)
+# Sub-bins por barra del histograma; la KDE se estima sobre esta malla fina.
+KDE_RESOLUTION = 20
+
+
+def _render_plot(method: str, kwargs: dict, output_dir: str, image_format: str) -> str:
+    """
+    Dibuja un gráfico en modo sin pantalla. Vive a nivel de módulo para
+    poder ejecutarse en un proceso trabajador.
+    """
+    visualizer = DataVisualization(output_dir=output_dir, image_format=image_format)
+    return getattr(visualizer, method)(**kwargs)
+
+
+def render_report(plots: dict, output_dir: str, image_format: str = "png", workers: int = None) -> dict:
+    """
+    Dibuja varios gráficos independientes a archivos, en paralelo.
+
+    Args:
+        plots (dict): Método de `DataVisualization` → argumentos, normalmente
+            con los agregados ya calculados (ver `DataVisualization.report_aggregates`)
+            para no enviar los datos completos a cada proceso.
+        output_dir (str): Carpeta de destino.
+        image_format (str): "png" o "svg". Por defecto, "png".
+        workers (int, optional): Número de procesos. Por defecto, uno por CPU.
+
+    Returns:
+        dict: Método → ruta del archivo generado.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(plots))
+    if workers <= 1:
+        return {
+            method: _render_plot(method, kwargs, output_dir, image_format)
+            for method, kwargs in plots.items()
+        }
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {
+            method: executor.submit(_render_plot, method, kwargs, output_dir, image_format)
+            for method, kwargs in plots.items()
+        }
+        return {method: future.result() for method, future in futures.items()}
+
 
 class DataVisualization:
     """
     Clase para generar visualizaciones basadas en los datos de libros y reseñas.
 
+    Cada gráfico puede recibir su agregado ya calculado (conteos, promedios
+    o histograma) en lugar de calcularlo sobre los datos completos. Con
+    `output_dir`, los gráficos se dibujan sin pantalla (backend Agg) y se
+    guardan como archivos en lugar de mostrarse.
+
     Attributes:
         book_details (pd.DataFrame): DataFrame con detalles de los libros, como autores y categorías.
         reviews (pd.DataFrame): DataFrame con información de las reseñas, como puntuaciones y sentimientos.
+        output_dir (str): Carpeta donde se guardan los gráficos, o None para mostrarlos.
+        image_format (str): Formato de los archivos ("png" o "svg").
+        lists (dict): Columna de listas (`authors`, `categories`) → tabla
+            libro ↔ entidad de `explode_list_column`.
     """
-    def __init__(self, book_details: pd.DataFrame, reviews: pd.DataFrame):
+    def __init__(
+        self,
+        book_details: pd.DataFrame = None,
+        reviews: pd.DataFrame = None,
+        output_dir: str = None,
+        image_format: str = "png",
+        lists: dict = None,
+    ):
         """
         Inicializa el módulo de visualización con los datos necesarios.
 
         Args:
-            book_details (pd.DataFrame): DataFrame que contiene detalles de los libros.
-            reviews (pd.DataFrame): DataFrame que contiene información de las reseñas.
+            book_details (pd.DataFrame, optional): DataFrame que contiene detalles de los libros.
+            reviews (pd.DataFrame, optional): DataFrame que contiene información de las reseñas.
+            output_dir (str, optional): Carpeta de destino; activa el modo sin pantalla.
+            image_format (str): "png" o "svg". Por defecto, "png".
+            lists (dict, optional): Tablas libro ↔ entidad ya calculadas; las que
+                falten se calculan desde `book_details`.
+
+        Raises:
+            ValueError: Si el formato de imagen no es soportado.
         """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Formato de imagen '{image_format}' no soportado; use uno de {IMAGE_FORMATS}.")
         self.book_details = book_details
         self.reviews = reviews
+        self.output_dir = output_dir
+        self.image_format = image_format
+        self.lists = dict(lists or {})
+        if output_dir is not None:
+            matplotlib.use("Agg")
+
+    @staticmethod
+    def review_counts(reviews: pd.DataFrame, top_n: int = 10, column: str = "book_title") -> pd.Series:
+        """
+        Número de reseñas de los `top_n` libros más reseñados.
+        """
+        counts = reviews[column].value_counts().head(top_n)
+        # Con títulos categóricos, el índice conservaría todas las categorías.
+        counts.index = counts.index.astype(str)
+        return counts
+
+    @staticmethod
+    def author_counts(book_details: pd.DataFrame, top_n: int = 10, table: pd.DataFrame = None) -> pd.Series:
+        """
+        Número de libros de los `top_n` autores con más libros. Un libro con
+        varios autores suma uno a cada uno.
+
+        Args:
+            book_details (pd.DataFrame): Libros con la columna de listas `authors`.
+            top_n (int): Número de autores.
+            table (pd.DataFrame, optional): Tabla libro ↔ autor ya calculada.
+        """
+        if table is None:
+            table = explode_list_column(book_details["authors"], "author")
+        return entity_counts(table, "author", top_n)
+
+    @staticmethod
+    def category_ratings(book_details: pd.DataFrame, top_n: int = 10, table: pd.DataFrame = None) -> pd.Series:
+        """
+        Valoración promedio de las `top_n` categorías mejor valoradas. Cada
+        libro aporta a todas sus categorías.
+
+        Args:
+            book_details (pd.DataFrame): Libros con `categories` y `average_rating`.
+            top_n (int): Número de categorías.
+            table (pd.DataFrame, optional): Tabla libro ↔ categoría ya calculada.
+        """
+        if table is None:
+            table = explode_list_column(book_details["categories"], "category")
+        return entity_means(table, "category", book_details["average_rating"].to_numpy(), top_n)
 
-    def plot_top_books_by_reviews(self, top_n=10):
+    @staticmethod
+    def sentiment_histogram(scores, bins: int = 20, value_range: tuple = SENTIMENT_RANGE) -> tuple:
+        """
+        Histograma de sentimientos con NumPy sobre una malla fina de
+        `bins * KDE_RESOLUTION` sub-bins. Como los bordes son fijos, los
+        histogramas de distintos bloques se combinan sumando sus conteos.
+
+        Args:
+            scores (array-like): Puntajes de sentimiento.
+            bins (int): Número de barras del gráfico. Por defecto, 20.
+            value_range (tuple): Rango del histograma. Por defecto, (-1, 1).
+
+        Returns:
+            tuple: (conteos, bordes) de la malla fina.
+        """
+        values = np.asarray(scores, dtype=np.float64)
+        return np.histogram(values[~np.isnan(values)], bins * KDE_RESOLUTION, range=value_range)
+
+    @staticmethod
+    def binned_kde(counts: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        """
+        KDE gaussiana aproximada convolucionando los conteos de la malla fina
+        con un núcleo gaussiano (ancho de banda de Scott). Su costo depende
+        del número de sub-bins y no del número de reseñas.
+
+        Returns:
+            np.ndarray: Curva en las mismas unidades que `counts`.
+        """
+        total = counts.sum()
+        if total < 2:
+            return counts.astype(np.float64)
+        centers = (edges[:-1] + edges[1:]) / 2
+        mean = (counts * centers).sum() / total
+        std = np.sqrt((counts * (centers - mean) ** 2).sum() / total)
+        sigma = max(std * total ** (-1 / 5) / (edges[1] - edges[0]), 0.5)
+        half = min(int(np.ceil(4 * sigma)), (len(counts) - 1) // 2)
+        offsets = np.arange(-half, half + 1)
+        kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+        return np.convolve(counts, kernel / kernel.sum(), mode="same")
+
+    def report_aggregates(self, top_n: int = 10) -> dict:
+        """
+        Calcula los agregados de todos los gráficos que permiten los datos
+        cargados, listos para `render_report`.
+
+        Args:
+            top_n (int): Número de elementos de los gráficos de barras.
+
+        Returns:
+            dict: Método de gráfico → argumentos con su agregado.
+        """
+        plots = {}
+        if self.reviews is not None and "book_title" in self.reviews.columns:
+            plots["plot_top_books_by_reviews"] = {
+                "top_n": top_n, "review_counts": self.review_counts(self.reviews, top_n),
+            }
+        if self.book_details is not None and "authors" in self.book_details.columns:
+            plots["plot_top_authors_by_books"] = {
+                "top_n": top_n,
+                "author_counts": self.author_counts(self.book_details, top_n, self.lists.get("authors")),
+            }
+        if self.book_details is not None and {"categories", "average_rating"} <= set(self.book_details.columns):
+            plots["plot_average_ratings_by_category"] = {
+                "top_n": top_n, "category_ratings": self.category_ratings(
+                    self.book_details, top_n, self.lists.get("categories")
+                ),
+            }
+        if self.reviews is not None and "sentiment_score" in self.reviews.columns:
+            plots["plot_sentiment_distribution"] = {
+                "histogram": self.sentiment_histogram(self.reviews["sentiment_score"]),
+            }
+        return plots
+
+    def _finish(self, name: str):
+        """
+        Muestra el gráfico actual o, en modo sin pantalla, lo guarda y
+        devuelve su ruta.
+        """
+        if self.output_dir is None:
+            plt.show()
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{name}.{self.image_format}")
+        plt.savefig(path, bbox_inches="tight")
+        plt.close("all")
+        return path
+
+    @staticmethod
+    def _barplot(values: pd.Series, palette: str):
+        labels = list(values.index)
+        sns.barplot(x=values.to_numpy(), y=labels, hue=labels, palette=palette, legend=False)
+
+    @instrument()
+    def plot_top_books_by_reviews(self, top_n=10, review_counts: pd.Series = None):
         """
         Genera un gráfico de barras con los libros más reseñados.
 
         Args:
             top_n (int): Número de libros a mostrar. Por defecto, 10.
+            review_counts (pd.Series, optional): Título → número de reseñas ya
+                calculado; si no se da, se calcula desde `reviews`.
+
+        Returns:
+            str: Ruta del archivo en modo sin pantalla; None si se muestra.
         """
-        review_counts = self.reviews['book_title'].value_counts().head(top_n)
+        if review_counts is None:
+            review_counts = self.review_counts(self.reviews, top_n)
         plt.figure(figsize=(10, 6))
-        sns.barplot(x=review_counts.values, y=review_counts.index, palette="viridis")
+        self._barplot(review_counts.head(top_n), "viridis")
         plt.title(f"Top {top_n} Libros con Más Reseñas", fontsize=16)
         plt.xlabel("Número de Reseñas", fontsize=12)
         plt.ylabel("Título del Libro", fontsize=12)
-        plt.show()
+        return self._finish("top_books_by_reviews")
 
-    def plot_top_authors_by_books(self, top_n=10):
+    @instrument()
+    def plot_top_authors_by_books(self, top_n=10, author_counts: pd.Series = None):
         """
         Genera un gráfico de barras con los autores más populares por cantidad de libros.
 
         Args:
             top_n (int): Número de autores a mostrar. Por defecto, 10.
+            author_counts (pd.Series, optional): Autor → número de libros ya calculado.
+
+        Returns:
+            str: Ruta del archivo en modo sin pantalla; None si se muestra.
         """
-        author_counts = self.book_details['authors'].value_counts().head(top_n)
+        if author_counts is None:
+            author_counts = self.author_counts(self.book_details, top_n, self.lists.get("authors"))
         plt.figure(figsize=(10, 6))
-        sns.barplot(x=author_counts.values, y=author_counts.index, palette="magma")
+        self._barplot(author_counts.head(top_n), "magma")
         plt.title(f"Top {top_n} Autores con Más Libros", fontsize=16)
         plt.xlabel("Número de Libros", fontsize=12)
         plt.ylabel("Autor", fontsize=12)
-        plt.show()
+        return self._finish("top_authors")
 
-    def plot_average_ratings_by_category(self, top_n=10):
+    @instrument()
+    def plot_average_ratings_by_category(self, top_n=10, category_ratings: pd.Series = None):
         """
         Genera un gráfico de barras con las categorías mejor valoradas en promedio.
 
         Args:
             top_n (int): Número de categorías a mostrar. Por defecto, 10.
+            category_ratings (pd.Series, optional): Categoría → valoración promedio ya calculada.
+
+        Returns:
+            str: Ruta del archivo en modo sin pantalla; None si se muestra.
         """
-        category_ratings = self.book_details.groupby('categories')['average_rating'].mean().sort_values(ascending=False).head(top_n)
+        if category_ratings is None:
+            category_ratings = self.category_ratings(self.book_details, top_n, self.lists.get("categories"))
         plt.figure(figsize=(10, 6))
-        sns.barplot(x=category_ratings.values, y=category_ratings.index, palette="coolwarm")
+        self._barplot(category_ratings.head(top_n), "coolwarm")
         plt.title(f"Top {top_n} Categorías Mejor Valoradas", fontsize=16)
         plt.xlabel("Promedio de Valoración", fontsize=12)
         plt.ylabel("Categoría", fontsize=12)
-        plt.show()
+        return self._finish("average_ratings_by_category")
 
-    def plot_sentiment_distribution(self):
+    @instrument()
+    def plot_sentiment_distribution(self, histogram: tuple = None):
         """
-        Genera un histograma de la distribución de sentimientos en las reseñas.
+        Genera un histograma de la distribución de sentimientos en las reseñas,
+        con su KDE, a partir de conteos precalculados con NumPy.
+
+        Args:
+            histogram (tuple, optional): (conteos, bordes) de `sentiment_histogram`,
+                posiblemente sumados sobre varios bloques; si no se da, se
+                calcula desde `reviews`.
+
+        Returns:
+            str: Ruta del archivo en modo sin pantalla; None si se muestra.
+
+        Raises:
+            ValueError: Si no se da el histograma y falta la columna `sentiment_score`.
         """
-        if 'sentiment_score' not in self.reviews.columns:
-            raise ValueError("La columna 'sentiment_score' no está en el DataFrame de reseñas.")
+        if histogram is None:
+            if 'sentiment_score' not in self.reviews.columns:
+                raise ValueError("La columna 'sentiment_score' no está en el DataFrame de reseñas.")
+            histogram = self.sentiment_histogram(self.reviews['sentiment_score'])
+        fine_counts, fine_edges = histogram
+        counts = fine_counts.reshape(-1, KDE_RESOLUTION).sum(axis=1)
+        edges = fine_edges[::KDE_RESOLUTION]
+        centers = (fine_edges[:-1] + fine_edges[1:]) / 2
         plt.figure(figsize=(10, 6))
-        sns.histplot(self.reviews['sentiment_score'], bins=20, kde=True, color="skyblue")
+        plt.bar(edges[:-1], counts, width=np.diff(edges), align="edge", color="skyblue", edgecolor="white")
+        plt.plot(centers, self.binned_kde(fine_counts, fine_edges) * KDE_RESOLUTION, color="skyblue")
         plt.title("Distribución de Sentimientos en Reseñas", fontsize=16)
         plt.xlabel("Puntaje de Sentimiento", fontsize=12)
         plt.ylabel("Frecuencia", fontsize=12)
-        plt.show()
+        return self._finish("sentiment_distribution")